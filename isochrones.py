@@ -6,7 +6,7 @@ Génère des courbes montrant les zones géographiques où une prière
 a lieu à la même heure
 
 Quatre classes disponibles :
-- IsochroneGenerator : Approche par grille (60×60)
+- IsochroneGenerator : Approche par grille (40×40 à 150×150 selon le pays)
 - IsochroneGeneratorExact : Approche par grille haute résolution (100×100)
 - IsochroneGeneratorDirect : Approche analytique lon = f(lat) - lignes
 - IsochroneGeneratorBands : Approche analytique lon = f(lat) - bandes colorées
@@ -14,11 +14,132 @@ Quatre classes disponibles :
 
 import numpy as np
 import math
+import re
+import datetime
+from matplotlib.collections import LineCollection, PolyCollection
+
+from numba_compat import NUMBA_AVAILABLE, njit, prange
+
+
+# Raffinement du jour julien (point fixe lon = f(lon)) : arrêt dès que la
+# correction passe sous _REFINE_TOL degré, au plus _REFINE_MAX_ITER passes
+_REFINE_TOL = 1e-4
+_REFINE_MAX_ITER = 3
+
+# Séparateur des réglages textuels ('18 deg', '90 min') : le nombre en tête
+_NUM_RE = re.compile('[^0-9.+-]')
+
+
+# Noyau analytique lon = f(lat) compilé par Numba (utilisé seulement si
+# Numba est installé ; sinon le chemin NumPy vectorisé est employé).
+# Pas de fastmath : NaN sert de valeur « pas de solution ».
+
+@njit(cache=True, error_model='numpy')
+def _fix_nb(a, mode):
+    """Normalise a dans [0, mode) (% flottant : fmod puis correction de signe)."""
+    return a % mode
+
+
+@njit(cache=True, error_model='numpy')
+def _sun_position_nb(jd):
+    """Déclinaison et équation du temps pour un jour julien."""
+    D = jd - 2451545.0
+    g = _fix_nb(357.529 + 0.98560028 * D, 360.0)
+    q = _fix_nb(280.459 + 0.98564736 * D, 360.0)
+    L = _fix_nb(q + 1.915 * math.sin(math.radians(g)) + 0.020 * math.sin(math.radians(2 * g)), 360.0)
+    e = math.radians(23.439 - 0.00000036 * D)
+    L_r = math.radians(L)
+    RA = _fix_nb(math.degrees(math.atan2(math.cos(e) * math.sin(L_r), math.cos(L_r))) / 15.0, 24.0)
+    eqt = q / 15.0 - RA
+    decl = math.degrees(math.asin(math.sin(e) * math.sin(L_r)))
+    return decl, eqt
+
+
+@njit(cache=True, error_model='numpy')
+def _lon_single_nb(lat, sin_lat, cos_lat, target_time, decl, sin_decl, cos_decl, eqt,
+                   tz_ref, sin_angle, ccw, is_asr, asr_factor):
+    """
+    Longitude pour une latitude et une heure cible (NaN si aucune).
+
+    Les sinus/cosinus de lat, decl et de l'angle sont fournis par l'appelant,
+    qui les calcule une seule fois hors des boucles.
+    """
+    if is_asr:
+        angle = -math.degrees(math.atan(1.0 / (asr_factor + math.tan(math.radians(abs(lat - decl))))))
+        sin_angle = math.sin(math.radians(angle))
+
+    if abs(cos_lat) < 1e-10 or abs(cos_decl) < 1e-10:
+        return np.nan
+
+    cos_H = (-sin_angle - sin_decl * sin_lat) / (cos_decl * cos_lat)
+    if not abs(cos_H) <= 1:
+        return np.nan
+
+    H = math.degrees(math.acos(cos_H))
+    base_lon = 15 * (12 - eqt + tz_ref - target_time)
+    return base_lon - H if ccw else base_lon + H
+
+
+@njit(cache=True, parallel=True, error_model='numpy')
+def _compute_lons_nb(lats, target_times, decl, eqt, tz_ref, angle, ccw, is_asr, asr_factor,
+                     jd_base, refine):
+    """
+    Longitudes (M, N) pour M heures cibles et N latitudes (NaN si aucune).
+
+    Parallélisé sur les niveaux : chaque fil traite des lignes entières.
+    """
+    m = target_times.shape[0]
+    n = lats.shape[0]
+    lons = np.empty((m, n))
+    sin_decl = math.sin(math.radians(decl))
+    cos_decl = math.cos(math.radians(decl))
+    sin_angle = math.sin(math.radians(angle))
+
+    # Trigonométrie par latitude calculée une fois pour tous les niveaux ;
+    # pour Asr, l'angle de la première passe ne dépend aussi que de lat
+    sin_lats = np.empty(n)
+    cos_lats = np.empty(n)
+    sin_angles = np.full(n, sin_angle)
+    for i in range(n):
+        lat_r = math.radians(lats[i])
+        sin_lats[i] = math.sin(lat_r)
+        cos_lats[i] = math.cos(lat_r)
+        if is_asr:
+            asr_angle = -math.degrees(math.atan(1.0 / (asr_factor + math.tan(math.radians(abs(lats[i] - decl))))))
+            sin_angles[i] = math.sin(math.radians(asr_angle))
+
+    for k in prange(m):
+        target_time = target_times[k]
+        for i in range(n):
+            lat = lats[i]
+            sin_lat = sin_lats[i]
+            cos_lat = cos_lats[i]
+            lon = _lon_single_nb(lat, sin_lat, cos_lat, target_time, decl, sin_decl, cos_decl, eqt,
+                                 tz_ref, sin_angles[i], ccw, False, asr_factor)
+            if refine and not math.isnan(lon):
+                # Une latitude sans solution au raffinement garde sa dernière longitude
+                for _ in range(_REFINE_MAX_ITER):
+                    decl_new, eqt_new = _sun_position_nb(jd_base - lon / (15 * 24.0))
+                    lon_new = _lon_single_nb(lat, sin_lat, cos_lat, target_time,
+                                             decl_new, math.sin(math.radians(decl_new)),
+                                             math.cos(math.radians(decl_new)), eqt_new,
+                                             tz_ref, sin_angle, ccw, is_asr, asr_factor)
+                    if math.isnan(lon_new):
+                        break
+                    delta = lon_new - lon
+                    lon = lon_new
+                    if abs(delta) <= _REFINE_TOL:
+                        break
+            lons[k, i] = lon
+    return lons
 
 
 class IsochroneGenerator:
     """Classe de base pour générer et tracer les courbes isochrones"""
 
+    # Côté de la grille ; None : adapté à l'étendue du pays (_grid_size)
+    grid_resolution = None
+
     def __init__(self, pray_calc, ax):
         """
         Initialise le générateur d'isochrones
@@ -32,6 +153,8 @@ class IsochroneGenerator:
         self.isochrone_lines = []
         self.current_prayer = None
         self.current_country = None
+        self._params_cache = {}
+        self._grid_cache = {}
 
     def tracer_isochrones(self, prayer_name, gdf, selected_date, country_name=None, country_timezone=None):
         """
@@ -63,20 +186,13 @@ class IsochroneGenerator:
         else:
             tz_fixed = round((min_lon + max_lon) / 2 / 15)
 
-        n_lat, n_lon = 60, 60
-        lats = np.linspace(min_lat, max_lat, n_lat)
-        lons = np.linspace(min_lon, max_lon, n_lon)
-
-        prayer_times_grid = np.zeros((n_lat, n_lon))
+        n_lat, n_lon = self._grid_size(bounds)
+        lats, lons, times = self._grid_times(selected_date, bounds, tz_fixed, n_lat, n_lon)
+        if prayer_name not in times:
+            return False
 
-        for i, lat in enumerate(lats):
-            for j, lon in enumerate(lons):
-                times = self.pray_calc.getTimes(
-                    selected_date, (lat, lon, 0), tz_fixed, format='Float'
-                )
-                if prayer_name in times:
-                    t = times[prayer_name]
-                    prayer_times_grid[i, j] = t * 60 if not math.isnan(t) else np.nan
+        # Les NaN (heure inexistante) se propagent tels quels
+        prayer_times_grid = times[prayer_name] * 60.0
 
         min_time = np.nanmin(prayer_times_grid)
         max_time = np.nanmax(prayer_times_grid)
@@ -88,13 +204,22 @@ class IsochroneGenerator:
         if len(levels) < 2:
             return False
 
-        contours = self.ax.contour(
-            lons, lats, prayer_times_grid,
-            levels=levels, colors='purple', linewidths=1.2, alpha=0.7
-        )
-
-        label_levels = [l for l in levels if int(l) % 5 == 0]
-        if label_levels:
+        # Algorithme 'serial' de contourpy, plus rapide que 'mpl2014' (défaut
+        # de matplotlib) ; les versions anciennes ne connaissent pas ce paramètre
+        contour_kwargs = dict(levels=levels, colors='purple', linewidths=1.2, alpha=0.7)
+        try:
+            contours = self.ax.contour(lons, lats, prayer_times_grid,
+                                       algorithm='serial', **contour_kwargs)
+        except TypeError:
+            contours = self.ax.contour(lons, lats, prayer_times_grid, **contour_kwargs)
+
+        # Seuls les niveaux effectivement tracés peuvent recevoir une étiquette.
+        # Un niveau non tracé a quand même une entrée dans allsegs, mais dont
+        # les segments sont vides (tableau (0, 2) avec matplotlib >= 3.8)
+        drawn = np.fromiter((any(len(seg) for seg in segs) for segs in contours.allsegs),
+                            dtype=bool, count=len(contours.allsegs))
+        label_levels = contours.levels[drawn & (contours.levels % 5 == 0)]
+        if label_levels.size:
             clabels = self.ax.clabel(
                 contours, levels=label_levels, inline=True, fontsize=8,
                 fmt=lambda x: self._format_time_label(x)
@@ -110,6 +235,58 @@ class IsochroneGenerator:
         self._update_title()
         return True
 
+    def _grid_size(self, bounds):
+        """
+        Résolution de la grille adaptée à l'étendue du pays.
+
+        Environ 8 points par degré sur le côté moyen de la boîte englobante,
+        bornés à [40, 150] : un petit pays n'évalue pas 3600 points inutiles,
+        un grand pays n'est pas sous-échantillonné. Une sous-classe peut
+        imposer une taille fixe par grid_resolution.
+
+        Returns:
+            tuple: (n_lat, n_lon)
+        """
+        if self.grid_resolution is not None:
+            return self.grid_resolution, self.grid_resolution
+        min_lon, min_lat, max_lon, max_lat = bounds
+        area = (max_lon - min_lon) * (max_lat - min_lat)
+        n = int(np.clip(np.sqrt(area) * 8, 40, 150))
+        return n, n
+
+    def _grid_times(self, selected_date, bounds, tz_fixed, n_lat, n_lon):
+        """
+        Heures de toutes les prières sur la grille, avec cache.
+
+        getTimesGrid calcule toutes les prières à la fois : changer de
+        prière pour le même pays et la même date réutilise la grille. La
+        clé inclut les réglages de PrayTimes, qui peuvent être modifiés en place.
+
+        Returns:
+            tuple: (lats, lons, times) où times associe chaque prière à un
+                   tableau (n_lat, n_lon) d'heures décimales (NaN si invalide)
+        """
+        if isinstance(selected_date, datetime.date):
+            date_tuple = (selected_date.year, selected_date.month, selected_date.day)
+        else:
+            date_tuple = tuple(selected_date)
+        settings = self.pray_calc.settings
+        key = (date_tuple, tuple(float(b) for b in bounds), tz_fixed, n_lat, n_lon,
+               tuple(sorted((k, str(v)) for k, v in settings.items())),
+               tuple(sorted(self.pray_calc.offset.items())), self.pray_calc.numIterations)
+        if key not in self._grid_cache:
+            min_lon, min_lat, max_lon, max_lat = bounds
+            lats = np.linspace(min_lat, max_lat, n_lat)
+            lons = np.linspace(min_lon, max_lon, n_lon)
+
+            # Toute la grille en un seul calcul vectorisé (heures décimales, NaN si invalide)
+            # lats en colonne, lons en ligne : getTimesGrid diffuse lui-même
+            times = self.pray_calc.getTimesGrid(date_tuple, lats[:, None], lons, tz_fixed)
+            if len(self._grid_cache) >= 16:
+                self._grid_cache.clear()
+            self._grid_cache[key] = (lats, lons, times)
+        return self._grid_cache[key]
+
     def _format_time_label(self, minutes):
         hours = int(minutes // 60) % 24
         mins = int(minutes % 60)
@@ -138,6 +315,17 @@ class IsochroneGenerator:
         self.isochrone_lines = []
 
 
+class IsochroneGeneratorExact(IsochroneGenerator):
+    """
+    Variante haute résolution de la méthode par grille (100×100).
+
+    Même tracé que IsochroneGenerator (grille getTimesGrid mise en cache,
+    contour, étiquettes) : seule la résolution change.
+    """
+
+    grid_resolution = 100
+
+
 class IsochroneGeneratorDirect(IsochroneGenerator):
     """
     Générateur d'isochrones par calcul analytique direct.
@@ -147,6 +335,7 @@ class IsochroneGeneratorDirect(IsochroneGenerator):
     def __init__(self, pray_calc, ax):
         super().__init__(pray_calc, ax)
         self.num_lat_points = 200
+        self._prepare_cache = {}
 
     def tracer_isochrones(self, prayer_name, gdf, selected_date, country_name=None, country_timezone=None):
         if gdf is None:
@@ -156,7 +345,107 @@ class IsochroneGeneratorDirect(IsochroneGenerator):
         self.current_prayer = prayer_name
         self.current_country = country_name
 
-        bounds = gdf.total_bounds
+        prepared = self._prepare(prayer_name, gdf, selected_date, country_timezone, margin=5)
+        if prepared is None:
+            return False
+
+        bounds, tz_fixed, jd, decl, eqt, prayer_params, levels, lats = prepared
+        min_lon, min_lat, max_lon, max_lat = bounds
+        angle, direction, is_asr, asr_factor = prayer_params
+
+        target_times = np.asarray(levels, dtype=float)[:, None] / 60.0
+
+        if direction is None:
+            # Dhuhr : une seule longitude par niveau, tracée en droite verticale
+            level_lons = self._compute_longitude(
+                lats[:1], target_times, decl, eqt, tz_fixed,
+                angle, direction, is_asr, asr_factor, jd_base=jd
+            )[:, 0]
+            valid = np.isfinite(level_lons) & (level_lons >= min_lon) & (level_lons <= max_lon)
+            if valid.any():
+                lines = self.ax.vlines(level_lons[valid], min_lat, max_lat,
+                                       colors='purple', linewidths=1.2, alpha=0.7)
+                self.isochrone_lines.append(lines)
+
+            label_lat = lats[len(lats) // 2]
+            for target_minutes, lon in zip(np.asarray(levels)[valid], level_lons[valid].tolist()):
+                if target_minutes % 5 == 0:
+                    self._add_line_label(lon, label_lat, target_minutes, bounds)
+
+            self._update_title()
+            return True
+
+        # Tous les niveaux et toutes les latitudes en un seul calcul (M, N)
+        all_lons = self._compute_longitude(
+            lats, target_times, decl, eqt, tz_fixed,
+            angle, direction, is_asr, asr_factor, jd_base=jd
+        )
+
+        segments = []
+        for target_minutes, lons in zip(levels, all_lons):
+            valid = np.isfinite(lons) & (lons >= min_lon) & (lons <= max_lon)
+            points = np.column_stack([lons, lats])
+
+            # Une courbe coupée (sortie de la boîte, pas de solution) donne
+            # plusieurs segments au lieu d'être reliée à travers le trou
+            for start, stop in self._true_runs(valid):
+                if stop - start >= 2:
+                    segments.append(points[start:stop])
+
+            if np.count_nonzero(valid) >= 2 and target_minutes % 5 == 0:
+                label_x, label_y = points[valid][np.count_nonzero(valid) // 2].tolist()
+                self._add_line_label(label_x, label_y, target_minutes, bounds)
+
+        # Un seul artiste pour toutes les courbes au lieu d'un Line2D par niveau
+        if segments:
+            lines = LineCollection(segments, colors='purple', linewidths=1.2, alpha=0.7)
+            self.ax.add_collection(lines)
+            self.ax.autoscale_view()
+            self.isochrone_lines.append(lines)
+
+        self._update_title()
+        return True
+
+    @staticmethod
+    def _true_runs(mask):
+        """
+        Plages contiguës de True d'un masque 1-D.
+
+        Returns:
+            zip: Couples (début, fin exclue) de chaque plage
+        """
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+        return zip(edges[::2].tolist(), edges[1::2].tolist())
+
+    def _add_line_label(self, label_x, label_y, target_minutes, bounds):
+        """Étiquette d'heure sur une courbe, si elle est assez loin des bords."""
+        min_lon, min_lat, max_lon, max_lat = bounds
+        margin = 0.02 * (max_lon - min_lon)
+        if (min_lon + margin <= label_x <= max_lon - margin and
+                min_lat + margin <= label_y <= max_lat - margin):
+            text = self.ax.text(label_x, label_y, self._format_time_label(target_minutes),
+                              fontsize=8, ha='center', va='center',
+                              bbox=dict(boxstyle='round,pad=0.2', facecolor='white',
+                                       edgecolor='none', alpha=0.7),
+                              clip_on=True)  # Activer le clipping aux limites des axes
+            self.isochrone_lines.append(text)
+
+    def _prepare(self, prayer_name, gdf, selected_date, country_timezone, margin):
+        """
+        Prélude commun aux tracés analytiques (lignes et bandes).
+
+        Le résultat est mis en cache par (prière, paramètres, date, boîte
+        englobante, fuseau, marge) : un nouveau rendu de la même prière ne
+        refait ni la position du soleil ni l'estimation de la plage d'heures.
+
+        Args:
+            margin (int): Marge en minutes autour de la plage d'heures estimée
+
+        Returns:
+            tuple: (bounds, tz_fixed, jd, decl, eqt, prayer_params, minutes, lats)
+                   ou None si la prière n'a pas de plage exploitable
+        """
+        bounds = tuple(float(b) for b in gdf.total_bounds)
         min_lon, min_lat, max_lon, max_lat = bounds
 
         # Fuseau horaire fixe du pays
@@ -165,134 +454,206 @@ class IsochroneGeneratorDirect(IsochroneGenerator):
         else:
             tz_fixed = round((min_lon + max_lon) / 2 / 15)
 
-        if type(selected_date).__name__ == 'date':
+        if isinstance(selected_date, datetime.date):
             date_tuple = (selected_date.year, selected_date.month, selected_date.day)
         else:
-            date_tuple = selected_date
-
-        jd = self._julian(date_tuple[0], date_tuple[1], date_tuple[2])
-        decl, eqt = self._sun_position(jd)
+            date_tuple = tuple(selected_date)
 
         prayer_params = self._get_prayer_params(prayer_name)
         if prayer_params is None:
-            return False
-
-        angle, direction, is_asr, asr_factor = prayer_params
+            return None
 
-        # Échantillonner pour trouver la plage d'heures
-        sample_times = []
-        for lat in np.linspace(min_lat, max_lat, 10):
-            for lon in np.linspace(min_lon, max_lon, 10):
-                times = self.pray_calc.getTimes(selected_date, (lat, lon, 0), tz_fixed, format='Float')
-                if prayer_name in times:
-                    t = times[prayer_name]
-                    if not math.isnan(t):
-                        sample_times.append(t * 60)
-
-        if not sample_times:
-            return False
+        key = (prayer_name, prayer_params, date_tuple, bounds, tz_fixed, margin, self.num_lat_points)
+        if key in self._prepare_cache:
+            return self._prepare_cache[key]
 
-        min_time = min(sample_times) - 5
-        max_time = max(sample_times) + 5
-        levels = list(range(int(np.floor(min_time)), int(np.ceil(max_time)) + 1))
+        jd = self._julian(date_tuple[0], date_tuple[1], date_tuple[2])
+        decl, eqt = self._sun_position(jd)
 
-        if len(levels) < 2:
-            return False
+        # Plage d'heures couverte par le pays
+        prepared = None
+        time_range = self._estimate_time_range(prayer_name, selected_date, bounds, tz_fixed,
+                                               decl, eqt, prayer_params)
+        if time_range is not None:
+            min_time = time_range[0] - margin
+            max_time = time_range[1] + margin
+            minutes = list(range(int(np.floor(min_time)), int(np.ceil(max_time)) + 1))
+            if len(minutes) >= 2:
+                lats = np.linspace(min_lat, max_lat, self.num_lat_points)
+                prepared = (bounds, tz_fixed, jd, decl, eqt, prayer_params, minutes, lats)
+
+        if len(self._prepare_cache) >= 64:
+            self._prepare_cache.clear()
+        self._prepare_cache[key] = prepared
+        return prepared
+
+    def _estimate_time_range(self, prayer_name, selected_date, bounds, tz_fixed,
+                             decl, eqt, prayer_params, fallback=True):
+        """
+        Estime la plage d'heures (en minutes) de la prière sur la boîte englobante.
 
-        lats = np.linspace(min_lat, max_lat, self.num_lat_points)
+        L'heure analytique t = 12 - eqt + tz - (lon -/+ H(lat))/15 est
+        linéaire en longitude : il suffit de l'évaluer sur les bords est et
+        ouest (deux coins pour Dhuhr, où H = 0), le long des latitudes des
+        courbes tracées plus lat = decl. H peut avoir un extremum intérieur
+        (Asr aux hautes latitudes) ou ne pas exister partout : la plage est
+        alors celle des heures effectivement traçables.
 
-        for target_minutes in levels:
-            target_time = target_minutes / 60.0
-            segment_points = []
+        Args:
+            fallback (bool): Si aucune latitude n'a de solution, revenir à
+                l'échantillonnage 10×10 par getTimesGrid
 
-            for lat in lats:
-                lon = self._compute_longitude(
-                    lat, target_time, decl, eqt, tz_fixed,
-                    angle, direction, is_asr, asr_factor, jd_base=jd
-                )
-                if lon is not None and min_lon <= lon <= max_lon:
-                    segment_points.append((lon, lat))
+        Returns:
+            tuple: (min_minutes, max_minutes) ou None si aucune heure trouvée
+        """
+        min_lon, min_lat, max_lon, max_lat = bounds
+        angle, direction, is_asr, asr_factor = prayer_params
 
-            if len(segment_points) >= 2:
-                curve_lons = [p[0] for p in segment_points]
-                curve_lats = [p[1] for p in segment_points]
-                line, = self.ax.plot(curve_lons, curve_lats, color='purple', linewidth=1.2, alpha=0.7)
-                self.isochrone_lines.append(line)
+        if direction is None:  # Dhuhr
+            H = np.zeros(1)
+        else:
+            sample_lats = np.linspace(min_lat, max_lat, self.num_lat_points)
+            if min_lat < decl < max_lat:
+                sample_lats = np.append(sample_lats, decl)
+            # Angle horaire H tel que lon = 15 * (12 - eqt + tz - t) -/+ H
+            H = 15 * (12 - eqt + tz_fixed) - self._compute_lon_single(
+                sample_lats, 0.0, decl, eqt, tz_fixed, angle, direction, is_asr, asr_factor)
+        times = (12 - eqt + tz_fixed - (np.array([[min_lon], [max_lon]]) + H) / 15) * 60
+
+        if np.isfinite(times).any():
+            return float(np.nanmin(times)), float(np.nanmax(times))
+        if fallback:
+            return self._sample_time_range(prayer_name, selected_date, bounds, tz_fixed)
+        return None
+
+    def _sample_time_range(self, prayer_name, selected_date, bounds, tz_fixed):
+        """
+        Plage d'heures (en minutes) par échantillonnage 10×10 avec getTimesGrid.
 
-                if target_minutes % 5 == 0:
-                    mid_idx = len(segment_points) // 2
-                    label_x, label_y = segment_points[mid_idx]
-                    margin = 0.02 * (max_lon - min_lon)
-                    if (min_lon + margin <= label_x <= max_lon - margin and
-                            min_lat + margin <= label_y <= max_lat - margin):
-                        text = self.ax.text(label_x, label_y, self._format_time_label(target_minutes),
-                                          fontsize=8, ha='center', va='center',
-                                          bbox=dict(boxstyle='round,pad=0.2', facecolor='white',
-                                                   edgecolor='none', alpha=0.7),
-                                          clip_on=True)  # Activer le clipping aux limites des axes
-                        self.isochrone_lines.append(text)
+        Returns:
+            tuple: (min_minutes, max_minutes) ou None si aucune heure trouvée
+        """
+        min_lon, min_lat, max_lon, max_lat = bounds
+        times = self.pray_calc.getTimesGrid(selected_date, np.linspace(min_lat, max_lat, 10)[:, None],
+                                            np.linspace(min_lon, max_lon, 10), tz_fixed)
+        if prayer_name not in times:
+            return None
 
-        self._update_title()
-        return True
+        sample_times = times[prayer_name] * 60.0
+        if np.isnan(sample_times).all():
+            return None
+        return float(np.nanmin(sample_times)), float(np.nanmax(sample_times))
 
-    def _compute_longitude(self, lat, target_time, decl, eqt, tz_ref,
+    def _compute_longitude(self, lats, target_time, decl, eqt, tz_ref,
                            angle, direction, is_asr, asr_factor, jd_base=None):
+        """
+        Longitudes de l'isochrone target_time pour un tableau de latitudes.
+
+        lats et target_time sont diffusés l'un contre l'autre : avec
+        target_time de forme (M, 1) et lats de forme (N,), tous les niveaux
+        sont résolus en une fois dans un tableau (M, N).
+
+        Returns:
+            np.ndarray: Longitudes en degrés (NaN si pas de solution)
+        """
+        lats = np.asarray(lats, dtype=float)
+        target_time = np.asarray(target_time, dtype=float)
+
         if direction is None:  # Dhuhr
             lon = 15 * (12 - eqt + tz_ref - target_time)
             if jd_base is not None:
-                for _ in range(2):
+                for _ in range(_REFINE_MAX_ITER):
                     jd_adj = jd_base - lon / (15 * 24.0)
-                    decl, eqt = self._sun_position(jd_adj)
-                    lon = 15 * (12 - eqt + tz_ref - target_time)
-            return lon
+                    decl, eqt = self._sun_position_interp(jd_adj)
+                    lon_new = 15 * (12 - eqt + tz_ref - target_time)
+                    converged = np.all(np.abs(lon_new - lon) <= _REFINE_TOL)
+                    lon = lon_new
+                    if converged:
+                        break
+            return lon + np.zeros(lats.shape)
+
+        # Boucle compilée pour les formes usuelles : lats (N,) et une heure
+        # scalaire ou une colonne d'heures (M, 1)
+        per_level = target_time.ndim == 2 and target_time.shape[1] == 1
+        if NUMBA_AVAILABLE and lats.ndim == 1 and (target_time.ndim == 0 or per_level):
+            lons = _compute_lons_nb(
+                lats, target_time.reshape(-1),
+                float(decl), float(eqt), float(tz_ref), float(angle or 0.0), direction == 'ccw',
+                bool(is_asr), float(asr_factor or 0.0),
+                float(jd_base) if jd_base is not None else 0.0, jd_base is not None
+            )
+            return lons if per_level else lons[0]
 
-        lon = self._compute_lon_single(lat, target_time, decl, eqt, tz_ref,
-                                       angle, direction, is_asr, asr_factor)
-        if lon is None:
-            return None
+        # sin/cos des latitudes communs à toutes les passes
+        lat_r = np.deg2rad(lats)
+        lat_trig = (np.sin(lat_r), np.cos(lat_r))
+        lon = self._compute_lon_single(lats, target_time, decl, eqt, tz_ref,
+                                       angle, direction, is_asr, asr_factor, lat_trig)
 
         if jd_base is not None:
-            for _ in range(2):
+            # Une latitude sans solution au raffinement garde sa dernière longitude
+            active = ~np.isnan(lon)
+            for _ in range(_REFINE_MAX_ITER):
                 jd_adj = jd_base - lon / (15 * 24.0)
-                decl_new, eqt_new = self._sun_position(jd_adj)
-                lon_new = self._compute_lon_single(lat, target_time, decl_new, eqt_new,
-                                                   tz_ref, angle, direction, is_asr, asr_factor)
-                if lon_new is None:
-                    return lon
-                lon = lon_new
+                decl_new, eqt_new = self._sun_position_interp(jd_adj)
+                lon_new = self._compute_lon_single(lats, target_time, decl_new, eqt_new, tz_ref,
+                                                   angle, direction, is_asr, asr_factor, lat_trig)
+                active &= ~np.isnan(lon_new)
+                delta = np.where(active, lon_new - lon, 0.0)
+                lon = np.where(active, lon_new, lon)
+                # Les latitudes convergées ne bougent plus
+                active &= np.abs(delta) > _REFINE_TOL
+                if not active.any():
+                    break
 
         return lon
 
-    def _compute_lon_single(self, lat, target_time, decl, eqt, tz_ref,
-                            angle, direction, is_asr, asr_factor):
-        if is_asr:
-            try:
-                angle = -self._arccot(asr_factor + self._tan(abs(lat - decl)))
-            except (ValueError, ZeroDivisionError):
-                return None
-
-        try:
-            cos_lat = self._cos(lat)
-            sin_lat = self._sin(lat)
-            cos_decl = self._cos(decl)
-            sin_decl = self._sin(decl)
-
-            if abs(cos_lat) < 1e-10 or abs(cos_decl) < 1e-10:
-                return None
-
-            cos_H = (-self._sin(angle) - sin_decl * sin_lat) / (cos_decl * cos_lat)
-            if abs(cos_H) > 1:
-                return None
+    def _compute_lon_single(self, lats, target_time, decl, eqt, tz_ref,
+                            angle, direction, is_asr, asr_factor, lat_trig=None):
+        """
+        Résolution analytique lon = f(lat), vectorisée sur les latitudes.
 
-            H = self._arccos(cos_H)
-        except (ValueError, ZeroDivisionError):
-            return None
+        Args:
+            lat_trig (tuple): (sin_lat, cos_lat) déjà calculés, pour les
+                appels répétés sur les mêmes latitudes
 
+        Returns:
+            np.ndarray: Longitudes en degrés (NaN si pas de solution)
+        """
+        # Ufuncs NumPy en radians directement (une conversion par grandeur)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if is_asr:
+                angle = -np.rad2deg(np.arctan(1.0 / (asr_factor + np.tan(np.deg2rad(np.abs(lats - decl))))))
+
+            if lat_trig is None:
+                lat_r = np.deg2rad(lats)
+                lat_trig = (np.sin(lat_r), np.cos(lat_r))
+            sin_lat, cos_lat = lat_trig
+            decl_r = np.deg2rad(decl)
+            cos_decl = np.cos(decl_r)
+            sin_decl = np.sin(decl_r)
+
+            cos_H = (-np.sin(np.deg2rad(angle)) - sin_decl * sin_lat) / (cos_decl * cos_lat)
+            mask = (np.abs(cos_lat) >= 1e-10) & (np.abs(cos_decl) >= 1e-10) & (np.abs(cos_H) <= 1)
+
+            H = np.rad2deg(np.arccos(np.where(mask, cos_H, 0.0)))
+
+        # Avec decl scalaire (première passe), H ne dépend que de la latitude :
+        # il est calculé sur (N,) puis diffusé contre les niveaux (M, 1)
         base_lon = 15 * (12 - eqt + tz_ref - target_time)
-        return base_lon - H if direction == 'ccw' else base_lon + H
+        lon = base_lon - H if direction == 'ccw' else base_lon + H
+        return np.where(mask, lon, np.nan)
 
     def _get_prayer_params(self, prayer):
         settings = self.pray_calc.settings
+        # PrayTimes modifie settings en place : la clé porte sur les valeurs lues
+        key = (prayer, settings.get('fajr', 18), settings.get('isha', 17),
+               settings.get('maghrib', 0), settings.get('asr', 'Standard'))
+        if key not in self._params_cache:
+            self._params_cache[key] = self._build_prayer_params(prayer, settings)
+        return self._params_cache[key]
+
+    def _build_prayer_params(self, prayer, settings):
         fajr_angle = self._eval(settings.get('fajr', 18))
         isha_angle = self._eval(settings.get('isha', 17))
         maghrib_angle = self._eval(settings.get('maghrib', 0))
@@ -311,10 +672,9 @@ class IsochroneGeneratorDirect(IsochroneGenerator):
         return prayer_config.get(prayer)
 
     def _eval(self, st):
-        import re
         if isinstance(st, (int, float)):
             return float(st)
-        val = re.split('[^0-9.+-]', str(st), 1)[0]
+        val = _NUM_RE.split(str(st), 1)[0]
         return float(val) if val else 0
 
     def _julian(self, year, month, day):
@@ -327,30 +687,54 @@ class IsochroneGeneratorDirect(IsochroneGenerator):
 
     def _sun_position(self, jd):
         D = jd - 2451545.0
-        g = self._fixangle(357.529 + 0.98560028 * D)
+        g = np.deg2rad(self._fixangle(357.529 + 0.98560028 * D))
         q = self._fixangle(280.459 + 0.98564736 * D)
-        L = self._fixangle(q + 1.915 * self._sin(g) + 0.020 * self._sin(2 * g))
-        e = 23.439 - 0.00000036 * D
-        RA = self._arctan2(self._cos(e) * self._sin(L), self._cos(L)) / 15.0
+        L = np.deg2rad(self._fixangle(q + 1.915 * np.sin(g) + 0.020 * np.sin(2 * g)))
+        e = np.deg2rad(23.439 - 0.00000036 * D)
+        sin_L = np.sin(L)
+        RA = np.rad2deg(np.arctan2(np.cos(e) * sin_L, np.cos(L))) / 15.0
         eqt = q / 15.0 - self._fixhour(RA)
-        decl = self._arcsin(self._sin(e) * self._sin(L))
+        decl = np.rad2deg(np.arcsin(np.sin(e) * sin_L))
         return decl, eqt
 
-    def _sin(self, d): return math.sin(math.radians(d))
-    def _cos(self, d): return math.cos(math.radians(d))
-    def _tan(self, d): return math.tan(math.radians(d))
-    def _arcsin(self, x): return math.degrees(math.asin(x))
-    def _arccos(self, x): return math.degrees(math.acos(x))
-    def _arctan2(self, y, x): return math.degrees(math.atan2(y, x))
-    def _arccot(self, x): return math.degrees(math.atan(1.0 / x))
+    def _sun_position_interp(self, jd, num_nodes=64):
+        """
+        Position du soleil pour un tableau de jours juliens proches.
+
+        La déclinaison et l'ascension droite sont calculées exactement sur
+        num_nodes jours juliens couvrant la plage puis interpolées
+        linéairement (écart < 1e-6° sur une journée). La longitude moyenne q,
+        linéaire en jd, reste exacte pour garder le même repliement de eqt.
+
+        Returns:
+            tuple: (decl, eqt) de même forme que jd
+        """
+        jd = np.asarray(jd, dtype=float)
+        finite = np.isfinite(jd)
+        # En dessous de quelques milliers de points le calcul direct est aussi rapide
+        if jd.size < 4096 or not finite.any():
+            return self._sun_position(jd)
+        lo, hi = jd[finite].min(), jd[finite].max()
+        if lo == hi:
+            return self._sun_position(jd)
+
+        nodes = np.linspace(lo, hi, num_nodes)
+        decl, eqt = self._sun_position(nodes)
+        # Ascension droite aux nœuds (eqt = q / 15 - RA), déroulée sur 24 h
+        q = self._fixangle(280.459 + 0.98564736 * (nodes - 2451545.0))
+        RA = np.unwrap(q / 15.0 - eqt, period=24.0)
+
+        q = self._fixangle(280.459 + 0.98564736 * (jd - 2451545.0))
+        eqt = q / 15.0 - self._fixhour(np.interp(jd, nodes, RA))
+        return np.interp(jd, nodes, decl), eqt
 
     def _fixangle(self, angle):
-        angle = angle - 360.0 * math.floor(angle / 360.0)
-        return angle + 360.0 if angle < 0 else angle
+        angle = angle - 360.0 * np.floor(angle / 360.0)
+        return np.where(angle < 0, angle + 360.0, angle)
 
     def _fixhour(self, hour):
-        hour = hour - 24.0 * math.floor(hour / 24.0)
-        return hour + 24.0 if hour < 0 else hour
+        hour = hour - 24.0 * np.floor(hour / 24.0)
+        return np.where(hour < 0, hour + 24.0, hour)
 
 
 class IsochroneGeneratorBands(IsochroneGeneratorDirect):
@@ -368,130 +752,90 @@ class IsochroneGeneratorBands(IsochroneGeneratorDirect):
         self.band_data = []
         self.band_polygons = []
         self.current_date = None
+        self._band_verts = []
+        self._band_facecolors = []
+        self._band_collection = None
 
     def tracer_isochrones(self, prayer_name, gdf, selected_date, country_name=None, country_timezone=None):
         if gdf is None:
             return False
 
+        polygons = self.compute_band_polygons(prayer_name, gdf, selected_date, country_timezone)
+        return self.draw_band_polygons(prayer_name, polygons, gdf, selected_date, country_name)
+
+    def draw_band_polygons(self, prayer_name, polygons, gdf, selected_date, country_name=None):
+        """
+        Dessine des bandes déjà calculées par compute_band_polygons.
+
+        Le calcul (géométrie et clipping Shapely, la partie coûteuse) ne
+        touche pas aux axes et peut donc tourner hors du fil Tk ; seul ce
+        rendu doit s'exécuter dans le fil de l'interface.
+
+        Args:
+            polygons (list[dict]): Résultat de compute_band_polygons
+            gdf: GeoDataFrame du pays (marges des étiquettes)
+
+        Returns:
+            bool: True si des bandes ont été dessinées
+        """
         self.clear_isochrones()
         self.band_data = []
         self.band_polygons = []
+        self._band_verts = []
+        self._band_facecolors = []
         self.current_prayer = prayer_name
         self.current_country = country_name
         self.current_date = selected_date
 
-        bounds = gdf.total_bounds
-        min_lon, min_lat, max_lon, max_lat = bounds
-
-        # Géométrie du pays pour le clipping
-        country_shape = gdf.geometry.unary_union
-
-        # Fuseau horaire fixe du pays
-        if country_timezone is not None:
-            tz_fixed = country_timezone
-        else:
-            tz_fixed = round((min_lon + max_lon) / 2 / 15)
-
-        if type(selected_date).__name__ == 'date':
-            date_tuple = (selected_date.year, selected_date.month, selected_date.day)
-        else:
-            date_tuple = selected_date
-
-        jd = self._julian(date_tuple[0], date_tuple[1], date_tuple[2])
-        decl, eqt = self._sun_position(jd)
-
-        prayer_params = self._get_prayer_params(prayer_name)
-        if prayer_params is None:
-            return False
-
-        angle, direction, is_asr, asr_factor = prayer_params
-
-        # Échantillonner pour trouver la plage d'heures
-        sample_times = []
-        for lat in np.linspace(min_lat, max_lat, 10):
-            for lon in np.linspace(min_lon, max_lon, 10):
-                times = self.pray_calc.getTimes(selected_date, (lat, lon, 0), tz_fixed, format='Float')
-                if prayer_name in times:
-                    t = times[prayer_name]
-                    if not math.isnan(t):
-                        sample_times.append(t * 60)
-
-        if not sample_times:
+        if not polygons:
             return False
 
-        min_time = min(sample_times) - 2
-        max_time = max(sample_times) + 2
-        minutes_list = list(range(int(np.floor(min_time)), int(np.ceil(max_time)) + 1))
-
-        if len(minutes_list) < 2:
-            return False
-
-        lats = np.linspace(min_lat, max_lat, self.num_lat_points)
-
-        for idx, target_minute in enumerate(minutes_list):
-            time_low = (target_minute - 0.5) / 60.0
-            time_high = (target_minute + 0.5) / 60.0
-
-            curve_low = []
-            curve_high = []
-
-            for lat in lats:
-                lon_low = self._compute_longitude(
-                    lat, time_low, decl, eqt, tz_fixed,
-                    angle, direction, is_asr, asr_factor, jd_base=jd
-                )
-                if lon_low is not None and min_lon <= lon_low <= max_lon:
-                    curve_low.append((lon_low, lat))
-
-                lon_high = self._compute_longitude(
-                    lat, time_high, decl, eqt, tz_fixed,
-                    angle, direction, is_asr, asr_factor, jd_base=jd
-                )
-                if lon_high is not None and min_lon <= lon_high <= max_lon:
-                    curve_high.append((lon_high, lat))
-
-            if len(curve_low) >= 2 and len(curve_high) >= 2:
-                self._draw_band(curve_low, curve_high, idx, target_minute,
-                               min_lon, max_lon, min_lat, max_lat, country_shape)
+        min_lon, min_lat, max_lon, max_lat = (float(b) for b in gdf.total_bounds)
+        for band in polygons:
+            self._draw_band(band, min_lon, max_lon, min_lat, max_lat)
 
+        self._flush_bands()
         self._update_title()
         return True
 
-    def _draw_band(self, curve_low, curve_high, color_idx, minute,
-                   min_lon, max_lon, min_lat, max_lat, country_shape=None):
-        from shapely.geometry import Polygon, MultiPolygon
+    def _band_boundaries(self, prepared):
+        """
+        Courbes frontières de toutes les bandes en un seul calcul.
 
-        polygon_points = list(curve_low) + list(reversed(curve_high))
-        if len(polygon_points) < 3:
-            return
+        La borne haute de la minute m (m + 0.5) est la borne basse de la
+        minute m + 1 : les M bandes n'ont que M + 1 frontières, résolues
+        ensemble en un tableau (M + 1, N).
 
-        polygon_points.append(polygon_points[0])
+        Returns:
+            list[np.ndarray]: M + 1 courbes (k, 2) en (lon, lat), restreintes
+                              à la boîte englobante
+        """
+        bounds, tz_fixed, jd, decl, eqt, prayer_params, minutes_list, lats = prepared
+        min_lon, min_lat, max_lon, max_lat = bounds
+        angle, direction, is_asr, asr_factor = prayer_params
 
-        color = self.colors[color_idx % len(self.colors)]
-        self.band_data.append((color, minute))
+        edges = np.append(np.asarray(minutes_list, dtype=float) - 0.5, minutes_list[-1] + 0.5)
+        all_lons = self._compute_longitude(
+            lats, edges[:, None] / 60.0, decl, eqt, tz_fixed,
+            angle, direction, is_asr, asr_factor, jd_base=jd
+        )
 
-        band_poly = Polygon(polygon_points)
-        if not band_poly.is_valid:
-            band_poly = band_poly.buffer(0)
+        # Un seul masque et un seul tableau de points (M + 1, N, 2) pour toutes
+        # les frontières ; chaque courbe n'en est qu'une sélection booléenne
+        valid = (all_lons >= min_lon) & (all_lons <= max_lon)  # faux sur NaN
+        points = np.empty(all_lons.shape + (2,))
+        points[..., 0] = all_lons
+        points[..., 1] = lats
+        return [row[mask] for row, mask in zip(points, valid)]
 
-        # Intersection avec la frontière du pays
-        if country_shape is not None:
-            clipped = band_poly.intersection(country_shape)
-        else:
-            clipped = band_poly
+    def _draw_band(self, band, min_lon, max_lon, min_lat, max_lat):
+        from shapely.geometry import Polygon, MultiPolygon
 
-        if clipped.is_empty:
-            return
+        clipped, color, minute = band['geometry'], band['color'], band['minute']
+        self.band_data.append((color, minute))
 
         # Stocker le polygone clippé pour l'export
-        self.band_polygons.append({
-            'geometry': clipped,
-            'minute': minute,
-            'time': self._format_time_label(minute),
-            'color': color,
-            'prayer': self.current_prayer,
-            'date': str(self.current_date),
-        })
+        self.band_polygons.append(band)
 
         # Collecter les polygones à dessiner (Polygon ou MultiPolygon)
         if isinstance(clipped, MultiPolygon):
@@ -502,11 +846,10 @@ class IsochroneGeneratorBands(IsochroneGeneratorDirect):
             # GeometryCollection : extraire les polygones
             polys = [g for g in clipped.geoms if isinstance(g, Polygon)]
 
+        # Polygones accumulés (anneaux déjà fermés), dessinés en une seule PolyCollection
         for poly in polys:
-            xs, ys = poly.exterior.coords.xy
-            fill = self.ax.fill(list(xs), list(ys), facecolor=color,
-                               edgecolor='purple', linewidth=0.5, alpha=0.6)
-            self.isochrone_lines.extend(fill)
+            self._band_verts.append(np.asarray(poly.exterior.coords))
+            self._band_facecolors.append(color)
 
         # Étiquette au centroïde du polygone clippé
         centroid = clipped.centroid
@@ -525,6 +868,35 @@ class IsochroneGeneratorBands(IsochroneGeneratorDirect):
                                clip_on=True)
             self.isochrone_lines.append(text)
 
+    def _flush_bands(self):
+        """
+        Dessine toutes les bandes accumulées en une seule PolyCollection.
+
+        La collection est créée au premier rendu puis réutilisée : les
+        rendus suivants ne font que remplacer ses polygones et ses couleurs.
+        """
+        if self._band_verts:
+            bands = self._band_collection
+            if bands is None or bands not in self.ax.collections:
+                bands = PolyCollection([], edgecolors='purple', linewidths=0.5, alpha=0.6)
+                self.ax.add_collection(bands)
+                self._band_collection = bands
+            bands.set_verts(self._band_verts, closed=False)
+            bands.set_facecolors(self._band_facecolors)
+            self.ax.update_datalim(np.concatenate(self._band_verts))
+            self.ax.autoscale_view()
+            self.isochrone_lines.append(bands)
+        self._band_verts = []
+        self._band_facecolors = []
+
+    def clear_isochrones(self):
+        # La collection des bandes reste sur les axes, vidée, pour le rendu suivant
+        bands = self._band_collection
+        if bands is not None and any(item is bands for item in self.isochrone_lines):
+            self.isochrone_lines = [item for item in self.isochrone_lines if item is not bands]
+            bands.set_verts([])
+        super().clear_isochrones()
+
     def compute_band_polygons(self, prayer_name, gdf, selected_date, country_timezone=None):
         """
         Calcule les polygones isochrones pour UNE prière, sans rendu matplotlib.
@@ -540,83 +912,63 @@ class IsochroneGeneratorBands(IsochroneGeneratorDirect):
             list[dict]: Liste de dicts avec clés geometry, minute, time, color, prayer, date
                         Retourne une liste vide en cas d'échec.
         """
-        if gdf is None:
-            return []
-
-        bounds = gdf.total_bounds
-        min_lon, min_lat, max_lon, max_lat = bounds
-
-        # Géométrie du pays pour le clipping
-        country_shape = gdf.geometry.unary_union
+        return self.clip_band_curves(
+            prayer_name, gdf, selected_date,
+            self.compute_band_curves(prayer_name, gdf, selected_date, country_timezone)
+        )
 
-        if country_timezone is not None:
-            tz_fixed = country_timezone
-        else:
-            tz_fixed = round((min_lon + max_lon) / 2 / 15)
+    def compute_band_curves(self, prayer_name, gdf, selected_date, country_timezone=None):
+        """
+        Première étape de compute_band_polygons : frontières analytiques.
 
-        if type(selected_date).__name__ == 'date':
-            date_tuple = (selected_date.year, selected_date.month, selected_date.day)
-        else:
-            date_tuple = selected_date
+        Fait appel aux noyaux Numba parallèles : à appeler depuis le fil
+        principal (la couche workqueue de Numba ne supporte ni les appels
+        concurrents ni d'être lancée depuis un autre fil).
 
-        jd = self._julian(date_tuple[0], date_tuple[1], date_tuple[2])
-        decl, eqt = self._sun_position(jd)
+        Returns:
+            tuple: (minutes, courbes) pour clip_band_curves, ou None
+        """
+        if gdf is None:
+            return None
 
-        prayer_params = self._get_prayer_params(prayer_name)
-        if prayer_params is None:
-            return []
+        prepared = self._prepare(prayer_name, gdf, selected_date, country_timezone, margin=2)
+        if prepared is None:
+            return None
 
-        angle, direction, is_asr, asr_factor = prayer_params
+        minutes_list = prepared[6]
+        return minutes_list, self._band_boundaries(prepared)
 
-        sample_times = []
-        for lat in np.linspace(min_lat, max_lat, 10):
-            for lon in np.linspace(min_lon, max_lon, 10):
-                times = self.pray_calc.getTimes(selected_date, (lat, lon, 0), tz_fixed, format='Float')
-                if prayer_name in times:
-                    t = times[prayer_name]
-                    if not math.isnan(t):
-                        sample_times.append(t * 60)
+    def clip_band_curves(self, prayer_name, gdf, selected_date, band_curves, country_shape=None):
+        """
+        Seconde étape de compute_band_polygons : polygones clippés au pays.
 
-        if not sample_times:
-            return []
+        N'utilise que Shapely (sans Numba ni matplotlib) : peut tourner
+        dans un fil de travail.
 
-        min_time = min(sample_times) - 2
-        max_time = max(sample_times) + 2
-        minutes_list = list(range(int(np.floor(min_time)), int(np.ceil(max_time)) + 1))
+        Args:
+            band_curves (tuple): Résultat de compute_band_curves
+            country_shape: Union des géométries de gdf déjà calculée (partagée
+                           entre plusieurs appels), sinon calculée ici
 
-        if len(minutes_list) < 2:
+        Returns:
+            list[dict]: Voir compute_band_polygons
+        """
+        if band_curves is None:
             return []
+        minutes_list, curves = band_curves
 
-        lats = np.linspace(min_lat, max_lat, self.num_lat_points)
+        # Géométrie du pays pour le clipping
+        if country_shape is None:
+            country_shape = gdf.geometry.union_all()
         from shapely.geometry import Polygon
 
         polygons = []
         for idx, target_minute in enumerate(minutes_list):
-            time_low = (target_minute - 0.5) / 60.0
-            time_high = (target_minute + 0.5) / 60.0
-
-            curve_low = []
-            curve_high = []
-
-            for lat in lats:
-                lon_low = self._compute_longitude(
-                    lat, time_low, decl, eqt, tz_fixed,
-                    angle, direction, is_asr, asr_factor, jd_base=jd
-                )
-                if lon_low is not None and min_lon <= lon_low <= max_lon:
-                    curve_low.append((lon_low, lat))
-
-                lon_high = self._compute_longitude(
-                    lat, time_high, decl, eqt, tz_fixed,
-                    angle, direction, is_asr, asr_factor, jd_base=jd
-                )
-                if lon_high is not None and min_lon <= lon_high <= max_lon:
-                    curve_high.append((lon_high, lat))
+            curve_low, curve_high = curves[idx], curves[idx + 1]
 
             if len(curve_low) >= 2 and len(curve_high) >= 2:
-                polygon_points = list(curve_low) + list(reversed(curve_high))
-                if len(polygon_points) >= 3:
-                    polygon_points.append(polygon_points[0])
+                if len(curve_low) + len(curve_high) >= 3:
+                    polygon_points = np.vstack([curve_low, curve_high[::-1], curve_low[:1]])
                     band_poly = Polygon(polygon_points)
                     if not band_poly.is_valid:
                         band_poly = band_poly.buffer(0)
@@ -10,22 +10,90 @@ Version modulaire avec :
 - Limitation du zoom maximum
 """
 
-import geopandas as gpd
+import numpy as np
 import matplotlib.pyplot as plt
+import matplotlib.patheffects as pe
+import shapely
+from shapely.geometry import box
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
+import importlib.util
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 import warnings
 
 # Import des modules personnalisés
 from praytimes import PrayTimes
-from isochrones import IsochroneGeneratorBands
 
 warnings.filterwarnings('ignore')
 
+# Fichier local des villes, à côté du script (résolu une fois à l'import)
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_CITIES_FILE = os.path.join(_SCRIPT_DIR, "populated_places.geojson")
+
+# Contour blanc des étiquettes de villes : un trait autour du texte au lieu
+# d'un cadre arrondi à dessiner par étiquette
+_CITY_LABEL_EFFECTS = [pe.withStroke(linewidth=2, foreground='white')]
+
+# Lecture en flux Arrow (colonnes entières au lieu d'objets par entité) si
+# pyarrow est installé ; sinon lecture pyogrio classique
+_PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Seules colonnes des villes utilisées (tri, filtre par pays, étiquettes)
+_CITIES_COLUMNS = ['name', 'pop_max', 'adm0_a3']
+
+# Options GDAL le temps d'un export GeoPackage : cache SQLite de 512 Mo
+# (construction des index spatiaux en mémoire) et pas de synchronisation
+# disque après chaque couche
+_GPKG_EXPORT_GDAL = {'OGR_SQLITE_CACHE': '512', 'OGR_SQLITE_SYNCHRONOUS': 'OFF'}
+
+
+def _colonnes_gadm(niveau):
+    """
+    Colonnes GADM conservées pour un niveau : pays, identifiant de l'entité
+    et noms de ses niveaux parents, pour l'export. Les autres (VARNAME_*,
+    NL_NAME_*, TYPE_*, HASC_*...) ne sont pas lues.
+    """
+    return (['GID_0', 'COUNTRY', f'GID_{niveau}']
+            + [f'NAME_{n}' for n in range(1, niveau + 1)])
+
+
+def _lire_couche(source, columns=None):
+    """
+    Lit un fichier ou une URL vectoriels avec le moteur pyogrio.
+
+    Import différé : geopandas (et pandas) n'est chargé qu'au premier
+    pays affiché, l'interface s'ouvre sans l'attendre.
+
+    Args:
+        columns (list): Colonnes à lire (les absentes sont ignorées), toutes
+                        si None
+    """
+    import geopandas as gpd
+    import pyogrio
+
+    # use_arrow demande GDAL >= 3.6
+    use_arrow = _PYARROW_AVAILABLE and pyogrio.__gdal_version__ >= (3, 6, 0)
+    return gpd.read_file(source, engine='pyogrio', use_arrow=use_arrow, columns=columns)
+
+
+def _ecrire_couche(gdf, path, driver, layer=None):
+    """
+    Écrit un GeoDataFrame avec pyogrio.write_dataframe : les colonnes sont
+    transmises en bloc à GDAL au lieu d'être converties entité par entité.
+
+    Args:
+        layer (str): Nom de la couche (GeoPackage multi-couches), ou None
+                     pour un fichier à couche unique
+    """
+    import pyogrio
+
+    pyogrio.write_dataframe(gdf, path, layer=layer, driver=driver)
+
 
 class MawaquitApp:
     """Application principale Mawaquit"""
@@ -76,8 +144,12 @@ class MawaquitApp:
             "India": 5,           # IST (+5:30 arrondi)
         }
 
-        # Calculateur de prières
+        # Calculateur de prières, un par méthode (réutilisé d'un changement à l'autre)
         self.pray_calc = PrayTimes('MWL')
+        self._pray_calcs = {'MWL': self.pray_calc}
+
+        # Heures affichées par (date, position arrondie à 1e-3°, méthode, fuseau)
+        self._times_cache = {}
 
         # Variables d'état
         self.marker_pos = None
@@ -86,23 +158,61 @@ class MawaquitApp:
         self.current_gdf_level1 = None
         self.current_gdf_level2 = None
         self.cities_gdf = None
-        self.cities_artists = []
+        self._cities_xy = None  # Coordonnées (N, 2) des villes, dans l'ordre de cities_gdf
+        self._cities_names = None  # Noms des villes (ou None sans colonne 'name')
+        self._cities_scatter = None  # Points des villes : une seule collection réutilisée
+        self._city_text_artists = []
         self.selected_date = date.today()
         self.initial_bounds = None
         self.max_zoom_factor = 20
+        # Dérivés d'initial_bounds, calculés une fois par pays (lus à chaque
+        # zoom et déplacement)
+        self._bounds_area = None
+        self._min_view_size = None
+        self.cities_per_view = 30  # Villes affichées à l'échelle du pays (plus en zoomant)
+        self.max_city_labels = 200  # Noms de villes au plus par vue
+        self.city_label_cell_px = 40  # Un seul nom par cellule de 40 px à l'écran
         self.current_timezone = 0  # Fuseau horaire du pays actuellement sélectionné
         self.current_country_name = None  # Nom du pays actuellement sélectionné
         self._updating_limits = False  # Flag pour éviter la récursion dans on_limits_changed
+        self._view_refresh_id = None  # Rafraîchissement de la vue en attente (after_idle)
+        self.detail_zoom_ratio = 4  # Au-delà, limites administratives découpées à la vue
+        self._limites_artists = []
+        self._niveau2_artists = []  # Limites du niveau 2 (sous-ensemble de _limites_artists)
+        self._limites_zoomees = False
+        self._limites_affichage = {}
+        self._map_background = None  # Fond de carte sans marqueur, pour le blitting
+        self._scroll_after_id = None  # Fin de rafale de molette en attente (after)
+        self._constrain_after_id = None  # Contrainte de vue en attente (after)
 
         # Cache GADM
         self.cache_dir = os.path.join(tempfile.gettempdir(), "gadm_cache")
         os.makedirs(self.cache_dir, exist_ok=True)
 
+        # Caches en mémoire : un même pays/niveau n'est lu qu'une fois par session
+        self._gadm_mem_cache = {}
+        self._cities_mem_cache = {}
+        self._plot_geom_cache = {}
+
+        # Villes de tous les pays, lues une seule fois et groupées par code pays
+        self._cities_by_country = None
+        self._cities_lock = threading.Lock()
+
+        # Un verrou par pays : un double clic ne lance pas deux téléchargements
+        self._chargement_locks = {}
+
+        # Niveaux GADM et villes d'un pays lus en parallèle
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._niveau2_attendu = None  # Pays dont le niveau 2 est encore en chargement
+
         # Créer l'interface
         self.setup_ui()
 
-        # Générateur d'isochrones (initialisé après l'UI)
-        self.isochrone_gen = IsochroneGeneratorBands(self.pray_calc, self.ax)
+        # Générateur d'isochrones : créé au premier tracé (voir
+        # _get_isochrone_gen), le module isochrones et Numba ne sont
+        # importés qu'à ce moment-là
+        self.isochrone_gen = None
+        self._isochrones_requete = 0  # Numéro du dernier calcul lancé
 
     def setup_ui(self):
         """Configure l'interface utilisateur"""
@@ -141,7 +251,7 @@ class MawaquitApp:
             state="readonly", width=15
         )
         method_combo.pack(side=tk.LEFT, padx=5)
-        method_combo.bind("<<ComboboxSelected>>", self.update_prayer_times)
+        method_combo.bind("<<ComboboxSelected>>", self.set_method)
 
         self.status_label = ttk.Label(control_frame, text="", foreground="blue")
         self.status_label.pack(side=tk.LEFT, padx=10)
@@ -186,7 +296,9 @@ class MawaquitApp:
         toolbar_frame = ttk.Frame(map_frame)
         toolbar_frame.pack(side=tk.TOP, fill=tk.X)
 
-        self.fig, self.ax = plt.subplots(figsize=(10, 8))
+        # DPI réduit : le coût d'un rendu Agg suit le nombre de pixels, et la
+        # carte est redessinée à chaque déplacement ou zoom
+        self.fig, self.ax = plt.subplots(figsize=(10, 8), dpi=80)
         self.canvas = FigureCanvasTkAgg(self.fig, master=map_frame)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
@@ -196,10 +308,7 @@ class MawaquitApp:
 
         self.canvas.mpl_connect('button_press_event', self.on_map_click)
         self.canvas.mpl_connect('scroll_event', self.on_scroll)
-
-        # Connecter les événements de changement de limites pour contraindre la navigation
-        self.ax.callbacks.connect('xlim_changed', self.on_limits_changed)
-        self.ax.callbacks.connect('ylim_changed', self.on_limits_changed)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
 
         # === Frame droit ===
         right_frame = ttk.Frame(main_frame, width=300)
@@ -352,21 +461,51 @@ class MawaquitApp:
 
     def telecharger_gadm(self, code_pays, niveau):
         """Télécharge ou charge depuis le cache les données GADM"""
-        cache_file = os.path.join(self.cache_dir, f"gadm41_{code_pays}_{niveau}.json")
+        key = (code_pays, niveau)
+        if key in self._gadm_mem_cache:
+            return self._gadm_mem_cache[key]
+
+        gdf = self._charger_gadm(code_pays, niveau)
+        # Un échec n'est pas mémorisé : un nouvel essai peut réussir
+        if gdf is not None:
+            # Borné à 16 pays × 3 niveaux : une longue session ne garde pas
+            # en mémoire chaque pays consulté
+            if len(self._gadm_mem_cache) >= 48:
+                self._gadm_mem_cache.clear()
+            self._gadm_mem_cache[key] = gdf
+        return gdf
+
+    def _charger_gadm(self, code_pays, niveau):
+        """Lit le cache disque GADM ou télécharge la couche"""
+        # Cache en GeoPackage (géométries WKB binaires + index spatial) : bien
+        # plus rapide à relire que le GeoJSON texte, sans dépendance en plus
+        cache_file = os.path.join(self.cache_dir, f"gadm41_{code_pays}_{niveau}.gpkg")
+        legacy_file = os.path.join(self.cache_dir, f"gadm41_{code_pays}_{niveau}.json")
+        columns = _colonnes_gadm(niveau)
 
         if os.path.exists(cache_file):
             try:
-                return gpd.read_file(cache_file)
+                return _lire_couche(cache_file, columns)
             except:
                 os.remove(cache_file)
 
+        # Ancien cache GeoJSON : converti une fois puis supprimé
+        if os.path.exists(legacy_file):
+            try:
+                gdf = _lire_couche(legacy_file, columns)
+                _ecrire_couche(gdf, cache_file, 'GPKG')
+                os.remove(legacy_file)
+                return gdf
+            except:
+                os.remove(legacy_file)
+
         url = f"https://geodata.ucdavis.edu/gadm/gadm4.1/json/gadm41_{code_pays}_{niveau}.json"
 
+        # Appelé depuis le fil de chargement : pas d'accès à Tk ici
         try:
-            self.status_label.config(text=f"Téléchargement niveau {niveau}...", foreground="orange")
-            self.root.update()
-            gdf = gpd.read_file(url)
-            gdf.to_file(cache_file, driver='GeoJSON')
+            print(f"Téléchargement {code_pays} niveau {niveau}...")
+            gdf = _lire_couche(url, columns)
+            _ecrire_couche(gdf, cache_file, 'GPKG')
             return gdf
         except Exception as e:
             print(f"Erreur téléchargement niveau {niveau}: {e}")
@@ -374,24 +513,69 @@ class MawaquitApp:
 
     def charger_villes(self, code_pays):
         """Charge les villes depuis le fichier local populated_places.geojson"""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        cities_file = os.path.join(script_dir, "populated_places.geojson")
-
-        if not os.path.exists(cities_file):
-            print(f"Fichier {cities_file} non trouvé")
-            return None
+        if code_pays in self._cities_mem_cache:
+            return self._cities_mem_cache[code_pays]
+
+        cities = self._lire_villes(code_pays)
+        if cities is not None:
+            self._cities_mem_cache[code_pays] = cities
+        return cities
+
+    def _villes_par_pays(self):
+        """
+        Lit populated_places.geojson une seule fois et le groupe par adm0_a3.
+
+        Le fichier est converti au premier lancement en GeoPackage dans le
+        cache (géométries binaires, trois à quatre fois plus rapide à relire
+        que le GeoJSON texte) ; la copie est refaite si le GeoJSON change.
+
+        Returns:
+            dict: code pays -> GeoDataFrame, ou None si le fichier est absent
+                  ou illisible
+        """
+        # Verrou : deux chargements de pays simultanés ne lisent pas deux fois
+        with self._cities_lock:
+            if self._cities_by_country is None:
+                if not os.path.exists(_CITIES_FILE):
+                    print(f"Fichier {_CITIES_FILE} non trouvé")
+                    return None
+
+                cities_all = self._lire_villes_cache()
+
+                # Filtrer par code pays (priorité à adm0_a3)
+                if 'adm0_a3' not in cities_all.columns:
+                    print("Colonne 'adm0_a3' non trouvée")
+                    return None
+
+                self._cities_by_country = dict(tuple(cities_all.groupby('adm0_a3', sort=False)))
+            return self._cities_by_country
+
+    def _lire_villes_cache(self):
+        """Lit les villes du cache GeoPackage, ou du GeoJSON en créant le cache"""
+        cache_file = os.path.join(self.cache_dir, "populated_places.gpkg")
+        if (os.path.exists(cache_file) and
+                os.path.getmtime(cache_file) >= os.path.getmtime(_CITIES_FILE)):
+            try:
+                return _lire_couche(cache_file, _CITIES_COLUMNS)
+            except:
+                os.remove(cache_file)
 
+        cities_all = _lire_couche(_CITIES_FILE, _CITIES_COLUMNS)
         try:
-            cities_all = gpd.read_file(cities_file)
+            _ecrire_couche(cities_all, cache_file, 'GPKG')
+        except Exception as e:
+            print(f"Cache des villes non écrit : {e}")
+        return cities_all
 
-            # Filtrer par code pays (priorité à adm0_a3)
-            if 'adm0_a3' in cities_all.columns:
-                cities_country = cities_all[cities_all['adm0_a3'] == code_pays].copy()
-            else:
-                print("Colonne 'adm0_a3' non trouvée")
+    def _lire_villes(self, code_pays):
+        """Extrait les villes d'un pays de populated_places.geojson"""
+        try:
+            cities_by_country = self._villes_par_pays()
+            if cities_by_country is None:
                 return None
 
-            if len(cities_country) == 0:
+            cities_country = cities_by_country.get(code_pays)
+            if cities_country is None or len(cities_country) == 0:
                 print(f"Aucune ville trouvée pour {code_pays}")
                 return None
 
@@ -414,41 +598,144 @@ class MawaquitApp:
 
         code_pays = self.pays_codes.get(pays)
 
-        self.ax.clear()
-        self.marker_pos = None
-        self.marker_artist = None
-        self.clear_isochrones()
-        self.clear_cities()
+        # Déjà en mémoire (bascule niveau 3, réaffichage) : tracé immédiat
+        if all((code_pays, niveau) in self._gadm_mem_cache for niveau in (0, 1, 2)):
+            self._finish_afficher_carte(pays, self._charger_couches(code_pays))
+            return
+
+        lock = self._chargement_locks.setdefault(code_pays, threading.Lock())
+        if not lock.acquire(blocking=False):
+            return  # Chargement de ce pays déjà en cours
+
+        self.status_label.config(text=f"Chargement de {pays}...", foreground="orange")
+
+        self._niveau2_attendu = pays
+
+        def worker():
+            # Téléchargement et lecture hors du fil Tk, les trois niveaux et
+            # les villes en parallèle ; le tracé revient dans la boucle
+            # d'événements par root.after. La carte est tracée dès les
+            # niveaux 0 et 1, le niveau 2 (le plus lourd) la complète ensuite
+            try:
+                futures = {f'niveau{niveau}': self._executor.submit(self.telecharger_gadm, code_pays, niveau)
+                           for niveau in (0, 1, 2)}
+                futures['villes'] = self._executor.submit(self.charger_villes, code_pays)
+
+                couches = {nom: futures[nom].result() for nom in ('niveau0', 'niveau1', 'villes')}
+                couches['niveau2'] = None
+                couches['affichage'] = self._affichages(code_pays, couches)
+                self.root.after(0, self._finish_afficher_carte, pays, couches)
+
+                niveau2 = futures['niveau2'].result()
+                affichage2 = (self._geometrie_affichage(code_pays, 2, niveau2)
+                              if niveau2 is not None else None)
+            except Exception as e:
+                # Sans cela, l'erreur se perd dans le fil de travail et le
+                # statut « Chargement » reste affiché
+                self.root.after(0, self._echec_chargement, pays, e)
+                return
+            finally:
+                lock.release()
+            self.root.after(0, self._finish_niveau2, pays, niveau2, affichage2)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _charger_couches(self, code_pays):
+        """Charge les niveaux GADM 0 à 2 et les villes d'un pays (sans Tk)"""
+        couches = {
+            'niveau0': self.telecharger_gadm(code_pays, 0),
+            'niveau1': self.telecharger_gadm(code_pays, 1),
+            'niveau2': self.telecharger_gadm(code_pays, 2),
+            'villes': self.charger_villes(code_pays),
+        }
+        couches['affichage'] = self._affichages(code_pays, couches)
+        return couches
+
+    def _affichages(self, code_pays, couches):
+        """Géométries simplifiées pour le tracé des couches chargées (hors du fil Tk)"""
+        return {
+            niveau: self._geometrie_affichage(code_pays, niveau, couches[f'niveau{niveau}'])
+            for niveau in (0, 1, 2) if couches[f'niveau{niveau}'] is not None
+        }
 
-        niveau0 = self.telecharger_gadm(code_pays, 0)
-        self.current_gdf_level1 = self.telecharger_gadm(code_pays, 1)
+    def _geometrie_affichage(self, code_pays, niveau, gdf):
+        """
+        Géométries simplifiées d'une couche GADM, pour le tracé uniquement.
+
+        La tolérance est une fraction de la largeur du pays (1/5000, 1/2000
+        pour le niveau 2 tracé en pointillés fins) : le nombre de sommets
+        chute sans différence visible à l'écran. Les GeoDataFrame complets
+        restent utilisés pour l'export et le découpage des isochrones.
+
+        Returns:
+            GeoSeries: Géométries simplifiées (mises en cache par pays/niveau)
+        """
+        key = (code_pays, niveau)
+        if key not in self._plot_geom_cache:
+            min_lon, _, max_lon, _ = gdf.total_bounds
+            tol = (max_lon - min_lon) / (2000 if niveau >= 2 else 5000)
+            if len(self._plot_geom_cache) >= 48:
+                self._plot_geom_cache.clear()
+            self._plot_geom_cache[key] = gdf.geometry.simplify(tol, preserve_topology=True)
+        return self._plot_geom_cache[key]
+
+    def _finish_afficher_carte(self, pays, couches):
+        """Trace la carte une fois les couches chargées (fil Tk)"""
+        # Un autre pays a été choisi pendant le chargement
+        if pays != self.pays_var.get():
+            return
 
+        niveau0 = couches['niveau0']
         if niveau0 is None:
             self.status_label.config(text="Erreur chargement", foreground="red")
             return
 
+        # Retirer les villes avant ax.clear(), qui les détache sans les oublier
+        self.clear_cities()
+        self.ax.clear()
+        self._limites_artists = []
+        self._niveau2_artists = []
+
+        # ax.clear() remplace aussi le registre des callbacks des axes :
+        # les changements de limites sont reconnectés après chaque effacement
+        self.ax.callbacks.connect('xlim_changed', self.on_limits_changed)
+        self.ax.callbacks.connect('ylim_changed', self.on_limits_changed)
+
+        self.marker_pos = None
+        self.marker_artist = None
+        self.clear_isochrones()
+
+        self.current_gdf_level1 = couches['niveau1']
+
         self.current_gdf = niveau0
-        self.initial_bounds = niveau0.total_bounds
+        # En flottants Python : l'arithmétique des rappels de navigation
+        # n'a pas à passer par des scalaires NumPy
+        self.initial_bounds = tuple(float(b) for b in niveau0.total_bounds)
+        min_lon, min_lat, max_lon, max_lat = self.initial_bounds
+        self._bounds_area = (max_lon - min_lon) * (max_lat - min_lat)
+        self._min_view_size = ((max_lon - min_lon) / self.max_zoom_factor,
+                               (max_lat - min_lat) / self.max_zoom_factor)
 
         # Mettre à jour le fuseau horaire du pays
         self.current_country_name = pays
         self.current_timezone = self.pays_timezones.get(pays, round(niveau0.total_bounds[0] / 15))
 
-        niveau0.plot(ax=self.ax, color='lightblue', alpha=0.3,
-                     edgecolor='navy', linewidth=2)
+        self._limites_affichage = couches['affichage']
+        self._limites_affichage[0].plot(ax=self.ax, color='lightblue', alpha=0.3,
+                                        edgecolor='navy', linewidth=2)
 
-        if self.current_gdf_level1 is not None:
-            self.current_gdf_level1.boundary.plot(ax=self.ax, edgecolor='darkred',
-                                                   linewidth=0.8, alpha=0.6)
+        self.current_gdf_level2 = couches['niveau2']
+        self.cities_gdf = couches['villes']
 
-        self.current_gdf_level2 = self.telecharger_gadm(code_pays, 2)
-        self.cities_gdf = self.charger_villes(code_pays)
+        # Coordonnées et noms extraits une fois par pays : draw_cities ne
+        # fait plus qu'indexer ces tableaux
+        self._cities_xy = self._cities_names = None
+        if self.cities_gdf is not None:
+            self._cities_xy = shapely.get_coordinates(self.cities_gdf.geometry.values)
+            if 'name' in self.cities_gdf.columns:
+                self._cities_names = self.cities_gdf['name'].to_numpy()
 
-        if self.show_level3_var.get() and self.current_gdf_level2 is not None:
-            self.current_gdf_level2.boundary.plot(
-                ax=self.ax, edgecolor='green',
-                linewidth=0.4, alpha=0.4, linestyle='--'
-            )
+        self._tracer_limites(zoomees=False)
 
         if self.show_cities_var.get() and self.cities_gdf is not None:
             self.draw_cities()
@@ -461,15 +748,102 @@ class MawaquitApp:
         self.ax.set_ylabel("Latitude")
         self.ax.grid(True, alpha=0.2)
 
-        self.canvas.draw()
+        self._demander_rendu()
         self.export_btn.config(state=tk.NORMAL)
         self.status_label.config(
             text=f"Carte chargée. Cliquez pour calculer les heures de prière",
             foreground="green"
         )
 
+    def _echec_chargement(self, pays, erreur):
+        """Signale l'échec du chargement d'un pays (fil Tk)"""
+        # Niveau 2 abandonné : plus attendu, case du niveau 3 décochée
+        self._finish_niveau2(pays, None, None)
+        if pays == self.pays_var.get():
+            self.status_label.config(text=f"Erreur chargement : {erreur}", foreground="red")
+
+    def _finish_niveau2(self, pays, niveau2, affichage2):
+        """Complète la carte avec le niveau 2, chargé après les autres (fil Tk)"""
+        if self._niveau2_attendu == pays:
+            self._niveau2_attendu = None
+
+        # La carte affichée n'est plus celle de ce pays
+        if pays != self.pays_var.get() or pays != self.current_country_name:
+            return
+
+        self.current_gdf_level2 = niveau2
+        if niveau2 is None:
+            if self.show_level3_var.get():
+                self.show_level3_var.set(False)
+                self.status_label.config(
+                    text="Niveau 3 non disponible pour ce pays",
+                    foreground="orange"
+                )
+            return
+
+        self._limites_affichage[2] = affichage2
+        if self.show_level3_var.get():
+            self._tracer_limites(self._limites_zoomees)
+            self._demander_rendu()
+
+    def _tracer_limites(self, zoomees):
+        """
+        (Re)trace les limites des niveaux 1 et 2.
+
+        À l'échelle du pays, les géométries simplifiées sont tracées en
+        entier. Zoomé au-delà de detail_zoom_ratio, seules les entités qui
+        touchent la vue sont tracées (.cx, par l'index spatial), à pleine
+        résolution puisqu'elles sont peu nombreuses.
+        """
+        for artist in self._limites_artists:
+            artist.remove()
+        self._limites_artists = []
+        self._niveau2_artists = []
+        self._limites_zoomees = zoomees
+
+        couches = [(1, self.current_gdf_level1, dict(edgecolor='darkred', linewidth=0.8, alpha=0.6))]
+        if self.show_level3_var.get():
+            couches.append((2, self.current_gdf_level2,
+                            dict(edgecolor='green', linewidth=0.4, alpha=0.4, linestyle='--')))
+
+        (x_min, x_max), (y_min, y_max) = self.ax.get_xlim(), self.ax.get_ylim()
+        for niveau, gdf, style in couches:
+            if gdf is None:
+                continue
+            if zoomees:
+                geometries = gdf.geometry.cx[x_min:x_max, y_min:y_max]
+            else:
+                geometries = self._limites_affichage[niveau]
+            if len(geometries) == 0:
+                continue
+            n_avant = len(self.ax.collections)
+            geometries.boundary.plot(ax=self.ax, **style)
+            artists = self.ax.collections[n_avant:]
+            self._limites_artists.extend(artists)
+            if niveau == 2:
+                self._niveau2_artists.extend(artists)
+
+    def _zoom_ratio(self):
+        """Rapport entre la surface du pays et la surface affichée (1 à l'échelle du pays)"""
+        if self.initial_bounds is None:
+            return 1.0
+        (x_min, x_max), (y_min, y_max) = self.ax.get_xlim(), self.ax.get_ylim()
+        view_area = (x_max - x_min) * (y_max - y_min)
+        if view_area <= 0:
+            return 1.0
+        return max(self._bounds_area / view_area, 1.0)
+
     def toggle_level3(self):
         """Active/désactive l'affichage du niveau 3"""
+        if (self.current_gdf_level2 is None and self._niveau2_attendu is not None
+                and self._niveau2_attendu == self.current_country_name):
+            # Tracé par _finish_niveau2 dès la fin du chargement
+            self.status_label.config(
+                text="Niveau 3 en cours de chargement...",
+                foreground="orange"
+            )
+            return
+
         if self.current_gdf_level2 is None:
             self.show_level3_var.set(False)
             self.status_label.config(
@@ -478,7 +852,18 @@ class MawaquitApp:
             )
             return
 
-        self.afficher_carte()
+        if self.current_gdf is None:
+            return
+
+        # Limites du niveau 2 déjà tracées pour cette vue : simple bascule de
+        # visibilité. Elles ne sont retracées que si elles n'existent pas
+        # (jamais affichées, ou vue changée pendant qu'elles étaient masquées)
+        if self._niveau2_artists:
+            for artist in self._niveau2_artists:
+                artist.set_visible(self.show_level3_var.get())
+        elif self.show_level3_var.get():
+            self._tracer_limites(self._limites_zoomees)
+        self._demander_rendu()
 
     def toggle_cities(self):
         """Active/désactive l'affichage des villes"""
@@ -497,119 +882,132 @@ class MawaquitApp:
             self.clear_cities()
             self.status_label.config(text="Villes masquées", foreground="blue")
 
-        self.canvas.draw()
+        self._demander_rendu()
 
     def draw_cities(self):
         """Dessine les villes sur la carte"""
         if self.cities_gdf is None:
             return
 
-        self.clear_cities()
+        self._clear_city_labels()
 
-        x = self.cities_gdf.geometry.x
-        y = self.cities_gdf.geometry.y
+        # Seules les villes de la vue courante sont dessinées (index spatial
+        # R-tree) ; l'ordre par population de charger_villes est conservé
+        (x_min, x_max), (y_min, y_max) = self.ax.get_xlim(), self.ax.get_ylim()
+        idx = self.cities_gdf.sindex.query(box(x_min, y_min, x_max, y_max), predicate='intersects')
 
-        # Dessiner les points pour toutes les villes
-        scatter = self.ax.scatter(
-            x, y, c='red', s=30, alpha=0.7,
-            marker='o', edgecolors='darkred',
-            linewidth=0.5, zorder=5
-        )
-        self.cities_artists.append(scatter)
+        # Niveau de détail : cities_per_view villes à l'échelle du pays,
+        # proportionnellement plus quand la surface affichée diminue
+        # (les plus peuplées d'abord, charger_villes les ayant triées)
+        idx = np.sort(idx)[:max(1, int(self.cities_per_view * self._zoom_ratio()))]
+
+        coords = self._cities_xy[idx]
+        x, y = coords[:, 0], coords[:, 1]
 
-        # Afficher les noms de TOUTES les villes
-        if 'name' in self.cities_gdf.columns:
-            for idx, row in self.cities_gdf.iterrows():
+        # Points des villes visibles : la collection existante reçoit les
+        # nouvelles positions au lieu d'être recréée à chaque vue
+        if self._cities_scatter is None:
+            self._cities_scatter = self.ax.scatter(
+                x, y, c='red', s=30, alpha=0.7,
+                marker='o', edgecolors='darkred',
+                linewidth=0.5, zorder=5
+            )
+        else:
+            self._cities_scatter.set_offsets(coords)
+
+        # Afficher les noms des villes visibles
+        if self._cities_names is not None:
+            # Désencombrement : grille de city_label_cell_px pixels à l'écran,
+            # un seul nom par cellule, celui de la ville la plus peuplée (la
+            # première, les villes étant triées). Tous les points restent
+            # dessinés par la collection ci-dessus
+            labelled = coords[:self.max_city_labels]
+            cells = np.floor_divide(self.ax.transData.transform(labelled),
+                                    self.city_label_cell_px).astype(np.int64)
+            keep = np.sort(np.unique(cells, axis=0, return_index=True)[1])
+            names = self._cities_names[idx[keep]]
+
+            # zip sur des tableaux plutôt qu'iterrows (une Series par ligne)
+            for city_x, city_y, name in zip(x[keep], y[keep], names):
                 text = self.ax.text(
-                    row.geometry.x, row.geometry.y,
-                    row['name'], fontsize=7,
+                    city_x, city_y,
+                    name, fontsize=7,
                     ha='left', va='bottom', zorder=6,
-                    bbox=dict(boxstyle='round,pad=0.3',
-                              facecolor='white', alpha=0.7,
-                              edgecolor='none'),
+                    path_effects=_CITY_LABEL_EFFECTS,
                     clip_on=True  # Activer le clipping aux limites des axes
                 )
-                self.cities_artists.append(text)
-
-    def clear_cities(self):
-        """Efface les villes de la carte"""
-        for artist in self.cities_artists:
-            try:
-                artist.remove()
-            except:
-                pass
-        self.cities_artists = []
-
-    def limit_zoom(self):
-        """Limite le niveau de zoom"""
-        if self.initial_bounds is None:
+                self._city_text_artists.append(text)
+
+    def schedule_view_refresh(self):
+        """Adapte limites et villes à la nouvelle vue, une fois par rafale d'événements"""
+        if self._view_refresh_id is None:
+            self._view_refresh_id = self.root.after_idle(self._refresh_view)
+
+    def _refresh_view(self):
+        """
+        Actualise la carte pour la vue courante, après tout changement de
+        limites (molette, barre d'outils, Home/Back/Forward) : limites
+        administratives découpées à la vue ou, en revenant à l'échelle du
+        pays, retracées en entier ; villes de la vue ; rendu.
+        """
+        self._view_refresh_id = None
+        if self.current_gdf is None:
             return
 
-        min_lon, min_lat, max_lon, max_lat = self.initial_bounds
-
-        initial_width = max_lon - min_lon
-        initial_height = max_lat - min_lat
-
-        min_width = initial_width / self.max_zoom_factor
-        min_height = initial_height / self.max_zoom_factor
+        # Limites découpées à la vue tant qu'on est zoomé, complètes sinon
+        zoomees = self._zoom_ratio() >= self.detail_zoom_ratio
+        if zoomees or self._limites_zoomees:
+            self._tracer_limites(zoomees)
 
-        cur_xlim = self.ax.get_xlim()
-        cur_ylim = self.ax.get_ylim()
+        if self.show_cities_var.get() and self.cities_gdf is not None:
+            self.draw_cities()
+        self._demander_rendu()
 
-        current_width = cur_xlim[1] - cur_xlim[0]
-        current_height = cur_ylim[1] - cur_ylim[0]
+    def clear_cities(self):
+        """Efface les villes de la carte"""
+        # Artistes toujours attachés aux axes (retirés avant tout ax.clear())
+        if self._cities_scatter is not None:
+            self._cities_scatter.remove()
+            self._cities_scatter = None
+        self._clear_city_labels()
+
+    def _clear_city_labels(self):
+        for text in self._city_text_artists:
+            text.remove()
+        self._city_text_artists = []
+
+    def _borner_zoom(self, xlim, ylim):
+        """
+        Élargit autour du même centre des limites plus étroites que le zoom
+        maximal (max_zoom_factor).
+
+        Returns:
+            tuple: (xlim, ylim)
+        """
+        min_width, min_height = self._min_view_size
+
+        current_width = xlim[1] - xlim[0]
+        current_height = ylim[1] - ylim[0]
 
         if current_width < min_width or current_height < min_height:
-            center_x = (cur_xlim[0] + cur_xlim[1]) / 2
-            center_y = (cur_ylim[0] + cur_ylim[1]) / 2
+            center_x = (xlim[0] + xlim[1]) / 2
+            center_y = (ylim[0] + ylim[1]) / 2
 
             new_width = max(current_width, min_width)
             new_height = max(current_height, min_height)
 
-            self.ax.set_xlim(center_x - new_width / 2, center_x + new_width / 2)
-            self.ax.set_ylim(center_y - new_height / 2, center_y + new_height / 2)
+            xlim = (center_x - new_width / 2, center_x + new_width / 2)
+            ylim = (center_y - new_height / 2, center_y + new_height / 2)
+
+        return xlim, ylim
 
     def constrain_view_to_bounds(self):
         """Contraint la vue aux limites du pays (empêche la navigation hors zone)"""
         if self.initial_bounds is None:
             return False
 
-        min_lon, min_lat, max_lon, max_lat = self.initial_bounds
-        cur_xlim = list(self.ax.get_xlim())
-        cur_ylim = list(self.ax.get_ylim())
-
-        view_width = cur_xlim[1] - cur_xlim[0]
-        view_height = cur_ylim[1] - cur_ylim[0]
-        bounds_width = max_lon - min_lon
-        bounds_height = max_lat - min_lat
-
-        changed = False
-
-        # Si la vue est plus large que les bounds, centrer sur les bounds
-        if view_width >= bounds_width:
-            center = (min_lon + max_lon) / 2
-            cur_xlim = [center - view_width / 2, center + view_width / 2]
-            changed = True
-        else:
-            # Contraindre la vue à rester dans les limites
-            if cur_xlim[0] < min_lon:
-                cur_xlim = [min_lon, min_lon + view_width]
-                changed = True
-            elif cur_xlim[1] > max_lon:
-                cur_xlim = [max_lon - view_width, max_lon]
-                changed = True
-
-        if view_height >= bounds_height:
-            center = (min_lat + max_lat) / 2
-            cur_ylim = [center - view_height / 2, center + view_height / 2]
-            changed = True
-        else:
-            if cur_ylim[0] < min_lat:
-                cur_ylim = [min_lat, min_lat + view_height]
-                changed = True
-            elif cur_ylim[1] > max_lat:
-                cur_ylim = [max_lat - view_height, max_lat]
-                changed = True
+        cur_xlim, cur_ylim = self._borner_vue(self.ax.get_xlim(), self.ax.get_ylim())
+        changed = cur_xlim is not None
 
         if changed:
             # Désactiver temporairement le callback pour éviter la récursion
@@ -620,11 +1018,76 @@ class MawaquitApp:
 
         return changed
 
+    def _borner_vue(self, xlim, ylim):
+        """
+        Ramène des limites dans la zone du pays (centrées si plus larges).
+
+        Returns:
+            tuple: (xlim, ylim) corrigées, ou (None, None) si rien ne change
+        """
+        min_lon, min_lat, max_lon, max_lat = self.initial_bounds
+        new_xlim = self._borner_axe(xlim, min_lon, max_lon)
+        new_ylim = self._borner_axe(ylim, min_lat, max_lat)
+        if new_xlim is xlim and new_ylim is ylim:
+            return None, None
+        return new_xlim, new_ylim
+
+    @staticmethod
+    def _borner_axe(lim, low, high):
+        """
+        Borne un intervalle (début, fin) d'un axe à [low, high], en gardant
+        sa largeur : début ramené dans [low, high - largeur], ou intervalle
+        centré s'il est plus large que la zone.
+
+        Returns:
+            L'intervalle reçu s'il est déjà dans la zone, sinon un tuple
+        """
+        width = lim[1] - lim[0]
+        if width >= high - low:
+            start = (low + high - width) / 2
+        else:
+            start = min(max(lim[0], low), high - width)
+        if start == lim[0]:
+            return lim
+        return (start, start + width)
+
+    def _appliquer_limites(self, xlim, ylim):
+        """
+        Applique de nouvelles limites en une seule fois, déjà bornées au zoom
+        maximal et à la zone du pays.
+
+        Les bornes sont calculées sur les valeurs demandées, sans aller-retour
+        par les axes, et posées avec emit=False : un seul set_xlim/set_ylim,
+        sans callback on_limits_changed à rattraper ensuite.
+        """
+        if self.initial_bounds is not None:
+            xlim, ylim = self._borner_zoom(xlim, ylim)
+            vue_xlim, vue_ylim = self._borner_vue(xlim, ylim)
+            if vue_xlim is not None:
+                xlim, ylim = vue_xlim, vue_ylim
+        self.ax.set_xlim(xlim, emit=False)
+        self.ax.set_ylim(ylim, emit=False)
+
     def on_limits_changed(self, ax):
-        """Callback appelé quand les limites de l'axe changent (zoom/pan toolbar)"""
-        if getattr(self, '_updating_limits', False):
+        """
+        Callback appelé quand les limites de l'axe changent : zoom/pan de la
+        barre d'outils, boutons Home/Back/Forward, touches h/c/v
+        """
+        if self._updating_limits:
             return
+
+        # Un déplacement émet des dizaines de changements (x puis y à chaque
+        # pas) : une seule contrainte, 50 ms après le premier
+        if self._constrain_after_id is None:
+            self._constrain_after_id = self.root.after(50, self._appliquer_contraintes)
+
+    def _appliquer_contraintes(self):
+        """Contraint la vue au pays et l'actualise après une rafale de changements"""
+        self._constrain_after_id = None
+        # Bornage d'abord : limites et villes sont recalculées sur la vue
+        # finale (rendu inclus), quelle que soit l'origine du changement
         self.constrain_view_to_bounds()
+        self.schedule_view_refresh()
 
     def on_map_click(self, event):
         """Gère le clic sur la carte"""
@@ -639,16 +1102,40 @@ class MawaquitApp:
         if self.marker_artist:
             self.marker_artist.remove()
 
+        # Marqueur animé : exclu des rendus complets, dessiné par blitting
         self.marker_artist = self.ax.plot(
             lon, lat, marker='+', color='red',
-            markersize=15, markeredgewidth=2.5, zorder=10
+            markersize=15, markeredgewidth=2.5, zorder=10, animated=True
         )[0]
 
-        self.canvas.draw()
+        if self._map_background is None:
+            self._demander_rendu()
+        else:
+            # Seul le marqueur est redessiné sur le fond mémorisé
+            self.canvas.restore_region(self._map_background)
+            self.ax.draw_artist(self.marker_artist)
+            self.canvas.blit(self.ax.bbox)
 
         self.marker_pos = (lat, lon)
         self.update_prayer_times()
 
+    def _demander_rendu(self):
+        """
+        Rendu complet différé (draw_idle).
+
+        Plusieurs demandes successives ne donnent qu'un seul rendu. D'ici
+        là, le fond mémorisé ne correspond plus à la carte : un clic
+        entre-temps attend ce rendu au lieu de blitter un fond périmé.
+        """
+        self._map_background = None
+        self.canvas.draw_idle()
+
+    def on_draw(self, event):
+        """Après chaque rendu complet : mémorise le fond et y ajoute le marqueur"""
+        self._map_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.marker_artist is not None:
+            self.ax.draw_artist(self.marker_artist)
+
     def on_scroll(self, event):
         """Gère le zoom avec la molette"""
         if event.inaxes != self.ax:
@@ -668,14 +1155,35 @@ class MawaquitApp:
         relx = (cur_xlim[1] - xdata) / (cur_xlim[1] - cur_xlim[0])
         rely = (cur_ylim[1] - ydata) / (cur_ylim[1] - cur_ylim[0])
 
-        self.ax.set_xlim([xdata - new_width * (1 - relx), xdata + new_width * relx])
-        self.ax.set_ylim([ydata - new_height * (1 - rely), ydata + new_height * rely])
+        self._appliquer_limites([xdata - new_width * (1 - relx), xdata + new_width * relx],
+                                [ydata - new_height * (1 - rely), ydata + new_height * rely])
+        self._map_background = None  # Fond d'avant le zoom
 
-        # Appliquer la limitation du zoom et contraindre à la zone
-        self.limit_zoom()
-        self.constrain_view_to_bounds()
+        # Une rafale de crans de molette ne donne qu'un seul rendu, 50 ms
+        # après le dernier événement
+        if self._scroll_after_id is not None:
+            self.root.after_cancel(self._scroll_after_id)
+        self._scroll_after_id = self.root.after(50, self._finalize_scroll)
 
-        self.canvas.draw_idle()
+    def _finalize_scroll(self):
+        """Fin d'une rafale de zoom : limites administratives, villes et rendu"""
+        self._scroll_after_id = None
+
+        # Limites déjà bornées à chaque cran par on_scroll
+        self._refresh_view()
+
+    def set_method(self, event=None):
+        """Change de méthode de calcul (liste déroulante)"""
+        method = self.method_var.get()
+        if self.pray_calc.calcMethod != method:
+            if method not in self._pray_calcs:
+                self._pray_calcs[method] = PrayTimes(method)
+            self.pray_calc = self._pray_calcs[method]
+            # Mettre à jour aussi le générateur d'isochrones
+            if self.isochrone_gen is not None:
+                self.isochrone_gen.pray_calc = self.pray_calc
+
+        self.update_prayer_times()
 
     def update_prayer_times(self, event=None):
         """Met à jour l'affichage des heures de prière"""
@@ -688,23 +1196,36 @@ class MawaquitApp:
         # Utiliser le fuseau horaire du pays (fixe) au lieu de round(lon / 15)
         tz = self.current_timezone
 
-        method = self.method_var.get()
-        if self.pray_calc.calcMethod != method:
-            self.pray_calc = PrayTimes(method)
-            # Mettre à jour aussi le générateur d'isochrones
-            self.isochrone_gen.pray_calc = self.pray_calc
-
-        times = self.pray_calc.getTimes(
-            self.selected_date,
-            (lat, lon, 0),
-            tz,
-            format='24h'
-        )
+        method = self.pray_calc.calcMethod
+
+        # Un nouveau clic dans la même cellule de ~100 m réutilise le calcul ;
+        # les réglages font partie de la clé (PrayTimes les modifie en place)
+        lat_key, lon_key = round(lat, 3), round(lon, 3)
+        key = (self.selected_date.toordinal(), lat_key, lon_key, method, tz,
+               str(sorted(self.pray_calc.settings.items())))
+        times = self._times_cache.get(key)
+        if times is None:
+            times = self.pray_calc.getTimes(
+                self.selected_date,
+                (lat_key, lon_key, 0),
+                tz,
+                format='24h'
+            )
+            if len(self._times_cache) >= 4096:
+                self._times_cache.clear()
+            self._times_cache[key] = times
 
         for prayer in self.prayer_labels:
             if prayer in times:
                 self.prayer_labels[prayer].config(text=times[prayer])
 
+    def _get_isochrone_gen(self):
+        """Crée le générateur d'isochrones à la première utilisation"""
+        if self.isochrone_gen is None:
+            from isochrones import IsochroneGeneratorBands
+            self.isochrone_gen = IsochroneGeneratorBands(self.pray_calc, self.ax)
+        return self.isochrone_gen
+
     def tracer_isochrones(self, prayer_name):
         """Trace les courbes isochrones pour une prière"""
         if self.current_gdf is None:
@@ -718,21 +1239,52 @@ class MawaquitApp:
             text=f"Calcul des isochrones pour {prayer_name}...",
             foreground="orange"
         )
-        self.root.update()
 
-        # Obtenir le nom du pays actuel
-        country_name = self.pays_var.get()
+        # Frontières analytiques (noyaux Numba, rapides) dans le fil Tk ; le
+        # clipping Shapely, la partie coûteuse, dans un fil à part. Seul le
+        # rendu revient dans le fil Tk, par root.after
+        iso_gen = self._get_isochrone_gen()
+        self._isochrones_requete += 1
+        requete = self._isochrones_requete
+        gdf, selected_date = self.current_gdf, self.selected_date
+        band_curves = iso_gen.compute_band_curves(prayer_name, gdf, selected_date,
+                                                  self.current_timezone)
+
+        def worker():
+            erreur = None
+            try:
+                polygons = iso_gen.clip_band_curves(prayer_name, gdf, selected_date, band_curves)
+            except Exception as e:
+                # Erreur GEOS (géométrie GADM invalide...) : transmise au fil
+                # Tk pour être affichée, au lieu de se perdre dans ce fil
+                print(f"Erreur calcul isochrones {prayer_name}: {e}")
+                polygons, erreur = [], e
+            self.root.after(0, self._finish_tracer_isochrones,
+                            requete, prayer_name, gdf, selected_date, polygons, erreur)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish_tracer_isochrones(self, requete, prayer_name, gdf, selected_date, polygons,
+                                  erreur=None):
+        """Dessine les bandes calculées par tracer_isochrones (fil Tk)"""
+        # Un autre tracé a été demandé, ou la carte a changé, entre-temps
+        if requete != self._isochrones_requete or gdf is not self.current_gdf:
+            return
 
-        success = self.isochrone_gen.tracer_isochrones(
-            prayer_name,
-            self.current_gdf,
-            self.selected_date,
-            country_name=country_name,
-            country_timezone=self.current_timezone
+        if erreur is not None:
+            self.status_label.config(
+                text=f"Erreur lors du traçage : {erreur}",
+                foreground="red"
+            )
+            return
+
+        success = self.isochrone_gen.draw_band_polygons(
+            prayer_name, polygons, gdf, selected_date,
+            country_name=self.pays_var.get()
         )
 
         if success:
-            self.canvas.draw()
+            self._demander_rendu()
             self.export_btn.config(state=tk.NORMAL)
             self.status_label.config(
                 text=f"Isochrones tracées pour {prayer_name}",
@@ -775,8 +1327,9 @@ class MawaquitApp:
         layers_frame.pack(fill=tk.X, padx=15, pady=5)
 
         # Isochrones : seulement la prière affichée
-        current_prayer = self.isochrone_gen.current_prayer
-        has_iso = self.isochrone_gen.has_isochrones() and current_prayer
+        iso_gen = self.isochrone_gen
+        current_prayer = iso_gen.current_prayer if iso_gen is not None else None
+        has_iso = iso_gen is not None and iso_gen.has_isochrones() and current_prayer
         iso_label = (f"Isochrones ({current_prayer})" if has_iso
                      else "Isochrones (aucune prière affichée)")
 
@@ -834,6 +1387,8 @@ class MawaquitApp:
 
     def _export_gpkg(self):
         """Exporte toutes les couches + isochrones des 5 prières en GeoPackage"""
+        import pyogrio
+
         pays = self.pays_var.get() or "export"
         date_str = self.selected_date.strftime('%Y-%m-%d')
 
@@ -846,51 +1401,112 @@ class MawaquitApp:
         if not path:
             return
 
+        options_gdal = {k: pyogrio.get_gdal_config_option(k) for k in _GPKG_EXPORT_GDAL}
+        pyogrio.set_gdal_config_options(_GPKG_EXPORT_GDAL)
         try:
             if self.current_gdf is not None:
-                self.current_gdf.to_file(path, driver='GPKG',
-                                         layer=f'{pays}_{date_str}_niveau0')
+                _ecrire_couche(self.current_gdf, path, 'GPKG',
+                               layer=f'{pays}_{date_str}_niveau0')
             if self.current_gdf_level1 is not None:
-                self.current_gdf_level1.to_file(path, driver='GPKG',
-                                                layer=f'{pays}_{date_str}_niveau1')
+                _ecrire_couche(self.current_gdf_level1, path, 'GPKG',
+                               layer=f'{pays}_{date_str}_niveau1')
             if self.current_gdf_level2 is not None:
-                self.current_gdf_level2.to_file(path, driver='GPKG',
-                                                layer=f'{pays}_{date_str}_niveau2')
+                _ecrire_couche(self.current_gdf_level2, path, 'GPKG',
+                               layer=f'{pays}_{date_str}_niveau2')
             if self.cities_gdf is not None:
-                self.cities_gdf.to_file(path, driver='GPKG',
-                                        layer=f'{pays}_{date_str}_villes')
-
-            # Calcul des isochrones : une couche par prière
+                _ecrire_couche(self.cities_gdf, path, 'GPKG',
+                               layer=f'{pays}_{date_str}_villes')
+
+            # Calcul des isochrones : une couche par prière. Frontières
+            # analytiques (noyaux Numba) dans le fil Tk, clipping Shapely des
+            # 5 prières en parallèle dans le pool pendant ce temps, sur une
+            # union du pays calculée une seule fois
+            iso_gen = self._get_isochrone_gen()
+            country_shape = self.current_gdf.geometry.union_all()
             prayers = ['fajr', 'dhuhr', 'asr', 'maghrib', 'isha']
+            clippings = []
             for idx, prayer in enumerate(prayers):
                 self.status_label.config(
                     text=f"Calcul isochrones {prayer} ({idx+1}/{len(prayers)})...",
                     foreground="orange"
                 )
-                self.root.update()
+                self.root.update_idletasks()
 
-                polys = self.isochrone_gen.compute_band_polygons(
+                band_curves = iso_gen.compute_band_curves(
                     prayer, self.current_gdf, self.selected_date,
                     self.current_timezone
                 )
+                clippings.append((prayer, self._executor.submit(
+                    iso_gen.clip_band_curves, prayer, self.current_gdf,
+                    self.selected_date, band_curves, country_shape
+                )))
+        except Exception as e:
+            self._fin_export_gpkg(path, options_gdal, e)
+            return
+
+        self.status_label.config(text="Écriture des isochrones...", foreground="orange")
+        self._ecrire_isochrones_gpkg(path, f'{pays}_{date_str}', clippings, options_gdal)
+
+    def _ecrire_isochrones_gpkg(self, path, prefixe, clippings, options_gdal):
+        """
+        Écrit les couches d'isochrones dans le GeoPackage, dans l'ordre des
+        prières, chacune dès la fin de son clipping (fil Tk).
+
+        Une prière encore en cours de clipping n'est pas attendue : l'écriture
+        reprend par root.after à la fin du calcul, l'interface reste libre
+        entre-temps.
+
+        Args:
+            clippings (list): (prière, future de clip_band_curves) restant à
+                              écrire, consommée au fur et à mesure
+        """
+        import geopandas as gpd
+
+        try:
+            while clippings:
+                prayer, clipping = clippings[0]
+                if not clipping.done():
+                    clipping.add_done_callback(
+                        lambda _: self.root.after(0, self._ecrire_isochrones_gpkg, path,
+                                                  prefixe, clippings, options_gdal)
+                    )
+                    return
+                del clippings[0]
+
+                polys = clipping.result()
                 if polys:
                     iso_gdf = gpd.GeoDataFrame(
                         polys, geometry='geometry', crs='EPSG:4326'
                     )
-                    iso_gdf.to_file(path, driver='GPKG',
-                                    layer=f'{pays}_{date_str}_isochrones_{prayer}')
-
-            self.status_label.config(
-                text=f"GeoPackage exporté : {os.path.basename(path)}",
-                foreground="green"
-            )
-            messagebox.showinfo("Export", f"GeoPackage exporté :\n{path}\n\n"
-                                "Ouvrez ce fichier dans QGIS.")
+                    _ecrire_couche(iso_gdf, path, 'GPKG',
+                                   layer=f'{prefixe}_isochrones_{prayer}')
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de l'export :\n{e}")
+            self._fin_export_gpkg(path, options_gdal, e)
+            return
+
+        self._fin_export_gpkg(path, options_gdal)
+
+    def _fin_export_gpkg(self, path, options_gdal, erreur=None):
+        """Termine un export GeoPackage : options GDAL rétablies, bilan (fil Tk)"""
+        import pyogrio
+
+        pyogrio.set_gdal_config_options(options_gdal)
+        if erreur is not None:
+            self.status_label.config(text="Erreur lors de l'export", foreground="red")
+            messagebox.showerror("Erreur", f"Erreur lors de l'export :\n{erreur}")
+            return
+
+        self.status_label.config(
+            text=f"GeoPackage exporté : {os.path.basename(path)}",
+            foreground="green"
+        )
+        messagebox.showinfo("Export", f"GeoPackage exporté :\n{path}\n\n"
+                            "Ouvrez ce fichier dans QGIS.")
 
     def _export_files(self, selected_layers, driver, extension):
         """Exporte les couches sélectionnées en fichiers séparés dans un dossier"""
+        import geopandas as gpd
+
         if not selected_layers:
             messagebox.showinfo("Export", "Aucune couche sélectionnée.")
             return
@@ -903,29 +1519,16 @@ class MawaquitApp:
         date_str = self.selected_date.strftime('%Y-%m-%d')
 
         try:
-            exported = []
-
-            if "niveau0" in selected_layers and self.current_gdf is not None:
-                p = os.path.join(folder, f"{pays}_{date_str}_niveau0{extension}")
-                self.current_gdf.to_file(p, driver=driver)
-                exported.append(os.path.basename(p))
-
-            if "niveau1" in selected_layers and self.current_gdf_level1 is not None:
-                p = os.path.join(folder, f"{pays}_{date_str}_niveau1{extension}")
-                self.current_gdf_level1.to_file(p, driver=driver)
-                exported.append(os.path.basename(p))
-
-            if "niveau2" in selected_layers and self.current_gdf_level2 is not None:
-                p = os.path.join(folder, f"{pays}_{date_str}_niveau2{extension}")
-                self.current_gdf_level2.to_file(p, driver=driver)
-                exported.append(os.path.basename(p))
-
-            if "villes" in selected_layers and self.cities_gdf is not None:
-                p = os.path.join(folder, f"{pays}_{date_str}_villes{extension}")
-                self.cities_gdf.to_file(p, driver=driver)
-                exported.append(os.path.basename(p))
-
-            if "isochrones" in selected_layers:
+            couches = [
+                ("niveau0", self.current_gdf),
+                ("niveau1", self.current_gdf_level1),
+                ("niveau2", self.current_gdf_level2),
+                ("villes", self.cities_gdf),
+            ]
+            couches = [(nom, gdf) for nom, gdf in couches
+                       if nom in selected_layers and gdf is not None]
+
+            if "isochrones" in selected_layers and self.isochrone_gen is not None:
                 # Exporter uniquement la prière actuellement affichée
                 current_prayer = self.isochrone_gen.current_prayer
                 band_polygons = self.isochrone_gen.get_band_polygons()
@@ -933,10 +1536,19 @@ class MawaquitApp:
                     iso_gdf = gpd.GeoDataFrame(
                         band_polygons, geometry='geometry', crs='EPSG:4326'
                     )
-                    p = os.path.join(folder,
-                                     f"{pays}_{date_str}_isochrones_{current_prayer}{extension}")
-                    iso_gdf.to_file(p, driver=driver)
-                    exported.append(os.path.basename(p))
+                    couches.append((f"isochrones_{current_prayer}", iso_gdf))
+
+            # Un fichier par couche, sans jeu de données partagé : écritures
+            # parallèles dans le pool (GDAL relâche le GIL pendant les E/S)
+            ecritures = []
+            for nom, gdf in couches:
+                p = os.path.join(folder, f"{pays}_{date_str}_{nom}{extension}")
+                ecritures.append((p, self._executor.submit(_ecrire_couche, gdf, p, driver)))
+
+            exported = []
+            for p, ecriture in ecritures:
+                ecriture.result()
+                exported.append(os.path.basename(p))
 
             self.status_label.config(
                 text=f"{len(exported)} fichier(s) exporté(s)",
@@ -950,7 +1562,8 @@ class MawaquitApp:
 
     def clear_isochrones(self):
         """Efface toutes les courbes isochrones"""
-        self.isochrone_gen.clear_isochrones()
+        if self.isochrone_gen is not None:
+            self.isochrone_gen.clear_isochrones()
         if self.current_gdf is not None:
             # Restaurer le titre par défaut
             pays = self.pays_var.get()
@@ -959,7 +1572,7 @@ class MawaquitApp:
                     f"Carte de {pays} - Cliquez pour placer le marqueur",
                     fontsize=12, fontweight='bold'
                 )
-            self.canvas.draw()
+            self._demander_rendu()
 
 
 if __name__ == "__main__":
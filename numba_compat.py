@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compatibilité optionnelle avec Numba pour Mawaquit
+
+Expose njit et prange : si Numba est installé, les noyaux numériques
+sont compilés en code natif (avec cache disque) ; sinon les décorateurs
+sont neutres et le même code s'exécute en Python pur.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Décorateur neutre utilisé quand Numba n'est pas installé."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -5,7 +5,14 @@ PrayTimes - Module de calcul des heures de prière islamiques
 Basé sur les algorithmes de PrayTimes.org
 """
 
+import datetime
 import math
+import re
+
+import numpy as np
+
+# Séparateur des réglages textuels ('18 deg', '90 min') : le nombre en tête
+_NUM_RE = re.compile('[^0-9.+-]')
 
 
 class PrayTimes():
@@ -14,6 +21,12 @@ class PrayTimes():
     Supporte plusieurs méthodes de calcul internationales
     """
 
+    # Attributs d'instance fixes (réglages et état du calcul en cours) :
+    # accès par emplacement au lieu d'un dictionnaire d'instance
+    __slots__ = ('calcMethod', 'settings', 'timeFormat', 'timeSuffixes',
+                 'invalidTime', 'numIterations', 'offset', 'lat', 'lng',
+                 'elv', '_sinLat', '_cosLat', 'timeZone', 'jDate')
+
     timeNames = {
         'imsak': 'Imsak',
         'fajr': 'Fajr',
@@ -63,6 +76,13 @@ class PrayTimes():
         'midnight': 'Standard'
     }
 
+    # Compléter une fois pour toutes les paramètres des méthodes
+    for _config in methods.values():
+        for _name, _value in defaultParams.items():
+            if _config['params'].get(_name) is None:
+                _config['params'][_name] = _value
+    del _config, _name, _value
+
     def __init__(self, method="MWL"):
         """
         Initialise le calculateur de prières
@@ -80,16 +100,8 @@ class PrayTimes():
             "highLats": 'NightMiddle'
         }
 
-        # Initialiser les paramètres des méthodes
-        for method, config in self.methods.items():
-            for name, value in self.defaultParams.items():
-                if name not in config['params'] or config['params'][name] is None:
-                    config['params'][name] = value
-
         # Appliquer les paramètres de la méthode choisie
-        params = self.methods[self.calcMethod]['params']
-        for name, value in params.items():
-            self.settings[name] = value
+        self.settings.update(self.methods[self.calcMethod]['params'])
 
         self.timeFormat = '24h'
         self.timeSuffixes = ['am', 'pm']
@@ -115,11 +127,16 @@ class PrayTimes():
         self.lng = coords[1]
         self.elv = coords[2] if len(coords) > 2 else 0
 
+        # sin/cos de la latitude, communs à tous les appels de sunAngleTime
+        lat_rad = math.radians(self.lat)
+        self._sinLat = math.sin(lat_rad)
+        self._cosLat = math.cos(lat_rad)
+
         if format is None:
             format = '24h'
         self.timeFormat = format
 
-        if type(date).__name__ == 'date':
+        if isinstance(date, datetime.date):
             date = (date.year, date.month, date.day)
 
         self.timeZone = timezone + (1 if dst else 0)
@@ -127,19 +144,159 @@ class PrayTimes():
 
         return self.computeTimes()
 
+    def getTimesGrid(self, date, lats, lons, timezone, dst=0):
+        """
+        Version vectorisée de getTimes(..., format='Float') sur des tableaux de positions
+
+        Mêmes étapes que computeTimes (une itération par numIterations,
+        ajustements hautes latitudes, minutes, offsets), appliquées à des
+        tableaux NumPy. Altitude nulle.
+
+        Args:
+            date: objet date ou tuple (year, month, day)
+            lats: tableau de latitudes
+            lons: tableau de longitudes (même forme que lats ou diffusable ;
+                  lats (n, 1) et lons (m,) évitent de construire la grille)
+            timezone: décalage horaire par rapport à UTC
+            dst: 1 si heure d'été, 0 sinon
+
+        Returns:
+            dict: Dictionnaire nom -> tableau d'heures décimales (NaN si invalide)
+        """
+        # Pas de broadcast_arrays : la position du soleil ne dépend que de la
+        # longitude et n'est calculée que sur la forme de lons tant que les
+        # heures de départ sont scalaires (première itération)
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        shape = np.broadcast_shapes(lats.shape, lons.shape)
+
+        if isinstance(date, datetime.date):
+            date = (date.year, date.month, date.day)
+
+        timeZone = timezone + (1 if dst else 0)
+        jDate = self.julian(date[0], date[1], date[2]) - lons / (15 * 24.0)
+        params = self.settings
+
+        def sunPosition(time):
+            D = jDate + time - 2451545.0
+            g = self._fixGrid(357.529 + 0.98560028 * D, 360.0)
+            q = self._fixGrid(280.459 + 0.98564736 * D, 360.0)
+            L = self._fixGrid(q + 1.915 * np.sin(np.radians(g)) + 0.020 * np.sin(np.radians(2 * g)), 360.0)
+            e = np.radians(23.439 - 0.00000036 * D)
+            L = np.radians(L)
+            RA = np.degrees(np.arctan2(np.cos(e) * np.sin(L), np.cos(L))) / 15.0
+            eqt = q / 15.0 - self._fixGrid(RA, 24.0)
+            decl = np.degrees(np.arcsin(np.sin(e) * np.sin(L)))
+            return decl, eqt
+
+        def midDay(time):
+            return self._fixGrid(12 - sunPosition(time)[1], 24.0)
+
+        # sin/cos de la latitude, communs à tous les appels de sunAngleTime
+        lat_r = np.radians(lats)
+        sin_lat = np.sin(lat_r)
+        cos_lat = np.cos(lat_r)
+
+        def sunAngleTime(angle, time, direction=None, position=None):
+            # Une seule position du soleil pour la déclinaison et le midi
+            decl, eqt = position if position is not None else sunPosition(time)
+            noon = self._fixGrid(12 - eqt, 24.0)
+            decl_r = np.radians(decl)
+            # Opérations en place sur le tableau pleine grille : un seul
+            # temporaire de la taille de la grille au lieu d'un par opérateur
+            cos_H = np.sin(decl_r) * sin_lat
+            np.add(cos_H, np.sin(np.radians(angle)), out=cos_H)
+            np.negative(cos_H, out=cos_H)
+            np.divide(cos_H, np.cos(decl_r) * cos_lat, out=cos_H)
+            # arccos hors domaine : NaN comme le ValueError de la version scalaire
+            cos_H[np.abs(cos_H) > 1] = np.nan
+            t = np.arccos(cos_H, out=cos_H)
+            np.multiply(t, 180.0 / (15.0 * math.pi), out=t)
+            if direction == 'ccw':
+                np.negative(t, out=t)
+            return np.add(t, noon, out=t)
+
+        def asrTime(factor, time):
+            position = sunPosition(time)
+            angle = -np.degrees(np.arctan(1.0 / (factor + np.tan(np.radians(np.abs(lats - position[0]))))))
+            return sunAngleTime(angle, time, position=position)
+
+        # Valeurs initiales approximatives
+        times = {
+            'imsak': 5, 'fajr': 5, 'sunrise': 6, 'dhuhr': 12,
+            'asr': 13, 'sunset': 18, 'maghrib': 18, 'isha': 18
+        }
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(self.numIterations):
+                times = {name: t / 24.0 for name, t in times.items()}
+                times = {
+                    'imsak': sunAngleTime(self.eval(params['imsak']), times['imsak'], 'ccw'),
+                    'fajr': sunAngleTime(self.eval(params['fajr']), times['fajr'], 'ccw'),
+                    'sunrise': sunAngleTime(self.riseSetAngle(0), times['sunrise'], 'ccw'),
+                    'dhuhr': midDay(times['dhuhr']),
+                    'asr': asrTime(self.asrFactor(params['asr']), times['asr']),
+                    'sunset': sunAngleTime(self.riseSetAngle(0), times['sunset']),
+                    'maghrib': sunAngleTime(self.eval(params['maghrib']), times['maghrib']),
+                    'isha': sunAngleTime(self.eval(params['isha']), times['isha']),
+                }
+
+        # adjustTimes
+        tzAdjust = timeZone - lons / 15.0
+        times = {name: t + tzAdjust for name, t in times.items()}
+
+        if params['highLats'] != 'None':
+            nightTime = self._fixGrid(times['sunrise'] - times['sunset'], 24.0)
+            for name, base, direction in (('imsak', 'sunrise', 'ccw'), ('fajr', 'sunrise', 'ccw'),
+                                          ('isha', 'sunset', None), ('maghrib', 'sunset', None)):
+                time, base = times[name], times[base]
+                portion = self.nightPortion(self.eval(params[name]), nightTime)
+                if direction == 'ccw':
+                    diff = self._fixGrid(base - time, 24.0)
+                else:
+                    diff = self._fixGrid(time - base, 24.0)
+                with np.errstate(invalid='ignore'):
+                    adjust = np.isnan(time) | (diff > portion)
+                times[name] = np.where(adjust, base + (-portion if direction == 'ccw' else portion), time)
+
+        if self.isMin(params['imsak']):
+            times['imsak'] = times['fajr'] - self.eval(params['imsak']) / 60.0
+        if self.isMin(params['maghrib']):
+            times['maghrib'] = times['sunset'] - self.eval(params['maghrib']) / 60.0
+        if self.isMin(params['isha']):
+            times['isha'] = times['maghrib'] - self.eval(params['isha']) / 60.0
+
+        times['dhuhr'] = times['dhuhr'] + self.eval(params['dhuhr']) / 60.0
+
+        # Calcul de minuit
+        if self.settings['midnight'] == 'Jafari':
+            times['midnight'] = times['sunset'] + self._fixGrid(times['fajr'] - times['sunset'], 24.0) / 2
+        else:
+            times['midnight'] = times['sunset'] + self._fixGrid(times['sunrise'] - times['sunset'], 24.0) / 2
+
+        return {name: np.broadcast_to(t, shape) + self.offset[name] / 60.0
+                for name, t in times.items()}
+
     def midDay(self, time):
         """Calcule le moment du midi solaire"""
         eqt = self.sunPosition(self.jDate + time)[1]
         return self.fixhour(12 - eqt)
 
-    def sunAngleTime(self, angle, time, direction=None):
-        """Calcule l'heure à laquelle le soleil atteint un angle donné"""
+    def sunAngleTime(self, angle, time, direction=None, position=None):
+        """
+        Calcule l'heure à laquelle le soleil atteint un angle donné
+
+        position : (déclinaison, équation du temps) déjà calculée pour
+        ce même instant par l'appelant (asrTime), sinon recalculée
+        """
         try:
-            decl = self.sunPosition(self.jDate + time)[0]
-            noon = self.midDay(time)
+            # Une seule position du soleil pour la déclinaison et le midi
+            decl, eqt = position if position is not None else self.sunPosition(self.jDate + time)
+            noon = self.fixhour(12 - eqt)
+            decl_rad = math.radians(decl)
             t = 1 / 15.0 * self.arccos(
-                (-self.sin(angle) - self.sin(decl) * self.sin(self.lat)) /
-                (self.cos(decl) * self.cos(self.lat))
+                (-self.sin(angle) - math.sin(decl_rad) * self._sinLat) /
+                (math.cos(decl_rad) * self._cosLat)
             )
             return noon + (-t if direction == 'ccw' else t)
         except ValueError:
@@ -147,20 +304,21 @@ class PrayTimes():
 
     def asrTime(self, factor, time):
         """Calcule l'heure de la prière Asr"""
-        decl = self.sunPosition(self.jDate + time)[0]
-        angle = -self.arccot(factor + self.tan(abs(self.lat - decl)))
-        return self.sunAngleTime(angle, time)
+        position = self.sunPosition(self.jDate + time)
+        angle = -self.arccot(factor + self.tan(abs(self.lat - position[0])))
+        return self.sunAngleTime(angle, time, position=position)
 
     def sunPosition(self, jd):
         """Calcule la position du soleil (déclinaison et équation du temps)"""
         D = jd - 2451545.0
-        g = self.fixangle(357.529 + 0.98560028 * D)
+        g = math.radians(self.fixangle(357.529 + 0.98560028 * D))
         q = self.fixangle(280.459 + 0.98564736 * D)
-        L = self.fixangle(q + 1.915 * self.sin(g) + 0.020 * self.sin(2 * g))
-        e = 23.439 - 0.00000036 * D
-        RA = self.arctan2(self.cos(e) * self.sin(L), self.cos(L)) / 15.0
+        L = math.radians(self.fixangle(q + 1.915 * math.sin(g) + 0.020 * math.sin(2 * g)))
+        e = math.radians(23.439 - 0.00000036 * D)
+        sin_L = math.sin(L)
+        RA = self.arctan2(math.cos(e) * sin_L, math.cos(L)) / 15.0
         eqt = q / 15.0 - self.fixhour(RA)
-        decl = self.arcsin(self.sin(e) * self.sin(L))
+        decl = self.arcsin(math.sin(e) * sin_L)
         return (decl, eqt)
 
     def julian(self, year, month, day):
@@ -287,7 +445,7 @@ class PrayTimes():
         portion = self.nightPortion(angle, night)
         diff = self.timeDiff(time, base) if direction == 'ccw' else self.timeDiff(base, time)
 
-        if math.isnan(time) or diff > portion:
+        if time != time or diff > portion:  # NaN : seule valeur différente d'elle-même
             time = base + (-portion if direction == 'ccw' else portion)
 
         return time
@@ -312,7 +470,7 @@ class PrayTimes():
 
     def getFormattedTime(self, time, format, suffixes=None):
         """Formate une heure selon le format demandé"""
-        if math.isnan(time):
+        if time != time:  # NaN
             return self.invalidTime
 
         if format == 'Float':
@@ -340,8 +498,10 @@ class PrayTimes():
 
     def eval(self, st):
         """Extrait une valeur numérique d'une chaîne"""
-        import re
-        val = re.split('[^0-9.+-]', str(st), 1)[0]
+        # Angles des méthodes (18, 17.5...) : déjà numériques
+        if isinstance(st, (int, float)):
+            return float(st)
+        val = _NUM_RE.split(str(st), 1)[0]
         return float(val) if val else 0
 
     def isMin(self, arg):
@@ -379,9 +539,13 @@ class PrayTimes():
     def fixhour(self, hour):
         return self.fix(hour, 24.0)
 
+    @staticmethod
+    def _fixGrid(a, mode):
+        """Version vectorisée de fix (les NaN sont propagés)"""
+        a = a - mode * np.floor(a / mode)
+        return np.where(a < 0, a + mode, a)
+
     def fix(self, a, mode):
         """Normalise une valeur dans un intervalle"""
-        if math.isnan(a):
-            return a
-        a = a - mode * (math.floor(a / mode))
-        return a + mode if a < 0 else a
\ No newline at end of file
+        # Modulo Python : du signe de mode, donc dans [0, mode) ; NaN propagé
+        return a % mode
\ No newline at end of file
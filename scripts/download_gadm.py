@@ -3,12 +3,24 @@
 Script pour télécharger et simplifier les données GADM pour Mawaquit Web
 """
 
-import geopandas as gpd
+import importlib.util
 import json
 import os
+import shutil
 import sys
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pyogrio
+import shapely
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Liste des pays avec leurs codes ISO
 COUNTRIES = [
     ("Algeria", "DZA"),
@@ -53,55 +65,117 @@ OUTPUT_DIR = Path(__file__).parent.parent / "web" / "data" / "gadm"
 # 0.01 degré ≈ 1 km à l'équateur
 SIMPLIFY_TOLERANCE = 0.01
 
+# Précision des coordonnées (4 décimales ≈ 11m)
+COORD_GRID_SIZE = 1e-4
+
+# Propriétés conservées dans les fichiers GeoJSON
+ESSENTIAL_PROPERTIES = ['GID_0', 'COUNTRY', 'NAME_1', 'GID_1']
+
+# Lecture en flux Arrow si pyarrow est installé (GDAL >= 3.6)
+USE_ARROW = (importlib.util.find_spec("pyarrow") is not None
+             and pyogrio.__gdal_version__ >= (3, 6, 0))
+
+# Téléchargements simultanés (le temps est surtout de l'attente réseau)
+MAX_WORKERS = 8
+
+# Délai d'attente des requêtes HTTP (secondes)
+HTTP_TIMEOUT = 60
+
+_print_lock = threading.Lock()
+
+
+def dumps(obj):
+    """Sérialise en JSON compact (bytes), avec orjson s'il est installé"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def write_geojson(gdf, output_file):
+    """
+    Écrit un GeoJSON compact entité par entité : seule l'entité en cours
+    est sérialisée en mémoire, pas la collection entière
+    """
+    with open(output_file, 'wb') as f:
+        f.write(b'{"type":"FeatureCollection","features":[')
+        for i, feature in enumerate(gdf.iterfeatures(drop_id=True)):
+            if i:
+                f.write(b',')
+            f.write(dumps(feature))
+        f.write(b']}')
+
+
+def remote_etag(url):
+    """ETag du fichier GADM distant (requête HEAD), None si indisponible"""
+    try:
+        request = urllib.request.Request(url, method='HEAD')
+        with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+            return response.headers.get('ETag')
+    except OSError:
+        return None
+
+
+def log(message):
+    """Affiche une ligne d'un seul tenant (les téléchargements sont parallèles)"""
+    with _print_lock:
+        print(message, flush=True)
+
 
 def download_and_simplify(country_name, country_code, level):
     """Télécharge et simplifie les données GADM pour un pays"""
     url = f"{GADM_BASE_URL}/gadm41_{country_code}_{level}.json"
     output_file = OUTPUT_DIR / f"{country_code}_{level}.json"
+    # ETag du fichier GADM d'origine, enregistré à côté du résultat
+    etag_file = output_file.with_suffix('.etag')
 
     # Skip if already exists
     if output_file.exists():
-        print(f"  ✓ {country_code} level {level} already exists, skipping")
-        return True
+        if not etag_file.exists():
+            log(f"  ✓ {country_code} level {level} already exists, skipping")
+            return True
+
+        # Retélécharger seulement si le fichier GADM a changé depuis
+        # (serveur injoignable : on garde la version existante)
+        etag = remote_etag(url)
+        if etag is None or etag == etag_file.read_text().strip():
+            log(f"  ✓ {country_code} level {level} up to date, skipping")
+            return True
 
     try:
-        print(f"  Downloading {country_code} level {level}...", end=" ", flush=True)
-        gdf = gpd.read_file(url)
+        log(f"  Downloading {country_name} ({country_code}) level {level}...")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Téléchargement dans un fichier temporaire pour récupérer
+            # l'ETag de la réponse
+            source = os.path.join(tmp_dir, os.path.basename(url))
+            with urllib.request.urlopen(url, timeout=HTTP_TIMEOUT) as response, \
+                    open(source, 'wb') as f:
+                shutil.copyfileobj(response, f)
+                etag = response.headers.get('ETag')
+
+            # Seules les propriétés essentielles sont lues (les absentes,
+            # comme NAME_1 au niveau 0, sont ignorées)
+            gdf = pyogrio.read_dataframe(source, columns=ESSENTIAL_PROPERTIES, use_arrow=USE_ARROW)
 
         # Simplifier les géométries
         gdf['geometry'] = gdf['geometry'].simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
 
-        # Convertir en GeoJSON
-        geojson = json.loads(gdf.to_json())
-
-        # Réduire la précision des coordonnées (4 décimales ≈ 11m)
-        def round_coords(coords):
-            if isinstance(coords[0], (int, float)):
-                return [round(c, 4) for c in coords]
-            return [round_coords(c) for c in coords]
-
-        for feature in geojson['features']:
-            if feature['geometry'] and feature['geometry']['coordinates']:
-                feature['geometry']['coordinates'] = round_coords(feature['geometry']['coordinates'])
-            # Garder uniquement les propriétés essentielles
-            props = feature['properties']
-            essential = {}
-            for key in ['GID_0', 'COUNTRY', 'NAME_1', 'GID_1']:
-                if key in props:
-                    essential[key] = props[key]
-            feature['properties'] = essential
-
-        # Sauvegarder
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(geojson, f, separators=(',', ':'))  # Compact JSON
+        # Réduire la précision des coordonnées : accrochage à la grille en
+        # un seul appel GEOS pour tout le pays
+        gdf['geometry'] = shapely.set_precision(gdf.geometry.values, grid_size=COORD_GRID_SIZE,
+                                               mode='pointwise')
+
+        # Sauvegarder en GeoJSON compact
+        write_geojson(gdf, output_file)
+        if etag:
+            etag_file.write_text(etag)
 
         # Afficher la taille
         size_kb = output_file.stat().st_size / 1024
-        print(f"OK ({size_kb:.1f} KB)")
+        log(f"  {country_code} level {level} OK ({size_kb:.1f} KB)")
         return True
 
     except Exception as e:
-        print(f"FAILED: {e}")
+        log(f"  {country_code} level {level} FAILED: {e}")
         return False
 
 
@@ -117,18 +191,18 @@ def main():
     success = 0
     failed = []
 
-    for i, (name, code) in enumerate(COUNTRIES, 1):
-        print(f"\n[{i}/{total}] {name} ({code})")
-
-        # Niveau 0 (frontières nationales)
-        if download_and_simplify(name, code, 0):
-            success += 1
-        else:
-            failed.append(f"{code}_0")
-
-        # Niveau 1 (régions/provinces)
-        if not download_and_simplify(name, code, 1):
-            failed.append(f"{code}_1")
+    # Niveau 0 (frontières nationales) et 1 (régions/provinces) de chaque
+    # pays, téléchargés en parallèle ; chaque tâche écrit son propre fichier
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        tasks = [(code, level, executor.submit(download_and_simplify, name, code, level))
+                 for name, code in COUNTRIES for level in (0, 1)]
+
+        for code, level, future in tasks:
+            if future.result():
+                if level == 0:
+                    success += 1
+            else:
+                failed.append(f"{code}_{level}")
 
     print("\n" + "=" * 60)
     print(f"Terminé: {success}/{total} pays téléchargés")